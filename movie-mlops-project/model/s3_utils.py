@@ -1,23 +1,56 @@
 # model/s3_utils.py
-import boto3
 import logging
 import os
+import threading
+
+# 프로세스 전체에서 공유하는 boto3 세션과 S3 클라이언트 (region별 1개, 스레드 간 공유 가능)
+_s3_session = None
+_s3_clients = {}
+_s3_lock = threading.Lock()
+
+
+def get_s3_client(region: str = None):
+    """S3 클라이언트를 최초 1회만 생성하고 이후에는 재사용"""
+    client = _s3_clients.get(region)
+    if client is None:
+        with _s3_lock:
+            client = _s3_clients.get(region)
+            if client is None:
+                # boto3는 import 비용이 커서 실제로 S3를 쓸 때만 로드
+                import boto3
+                from botocore.client import Config
+                
+                # 세션 1개만 생성 (자격 증명 체인/엔드포인트 정보 해석을 한 번만 수행)
+                global _s3_session
+                if _s3_session is None:
+                    _s3_session = boto3.session.Session()
+                
+                client = _s3_session.client(
+                    "s3",
+                    region_name=region,
+                    config=Config(
+                        max_pool_connections=50,
+                        connect_timeout=3,
+                        read_timeout=10,
+                        retries={"mode": "standard", "max_attempts": 3},
+                    ),
+                )
+                _s3_clients[region] = client
+    return client
 
 def upload_to_s3(local_path: str, bucket_name: str, s3_key: str):
-    s3 = boto3.client("s3")
     if not os.path.exists(local_path):
         raise FileNotFoundError(f"파일 없음: {local_path}")
     try:
-        s3.upload_file(local_path, bucket_name, s3_key)
+        get_s3_client().upload_file(local_path, bucket_name, s3_key)
         logging.info(f"✅ 업로드 성공: s3://{bucket_name}/{s3_key}")
     except Exception as e:
         logging.error(f"S3 업로드 실패: {e}")
         raise
 
 def download_from_s3(bucket_name: str, s3_key: str, local_path: str):
-    s3 = boto3.client("s3")
     try:
-        s3.download_file(bucket_name, s3_key, local_path)
+        get_s3_client().download_file(bucket_name, s3_key, local_path)
         logging.info(f"✅ 다운로드 성공: {local_path}")
     except Exception as e:
         logging.error(f"S3 다운로드 실패: {e}")
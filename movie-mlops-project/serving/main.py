@@ -1,17 +1,25 @@
-from fastapi import FastAPI, HTTPException, Query
+import os
+
+# NumPy/BLAS 스레드 수 기본값 (BLAS 라이브러리는 로드 시점에 읽으므로 numpy import 전에 설정)
+# - 행렬 연산은 XGBoost 예측뿐이고 그 스레드 수는 XGB_NTHREAD로 따로 조절하므로
+#   BLAS 스레드가 워커마다 코어 수만큼 생겨 서로 경합하지 않도록 1로 고정 (환경변수로 지정 시 그 값 사용)
+# - API 서버 진입점에서만 설정 (serving 패키지를 import하는 다른 프로세스에는 영향 없음)
+for _var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+    os.environ.setdefault(_var, "1")
+
+from fastapi import Depends, FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import uvicorn
 import logging
+import statistics
 import sys
+import traceback
 from datetime import datetime
-import os
 
-# 경로 설정
-current_dir = os.path.dirname(os.path.abspath(__file__))
-sys.path.append(current_dir)
-
-# 예측 서비스 import
-from services.prediction_service import SimplePredictionService
+# 예측 서비스 import (프로젝트 루트에서 serving 패키지로 실행)
+from serving.services.prediction_service import SimplePredictionService
+from serving.services.tmdb_service import TMDBService
 
 # ============================================================================
 # 🔧 통합 로깅 설정 (uvicorn과 통합)
@@ -42,10 +50,10 @@ def setup_logging():
     
     # 각 모듈별 로거 설정
     loggers = [
-        'main',
-        'services.prediction_service', 
-        'services.mlflow_service',
-        'services.data_service',
+        'serving.main',
+        'serving.services.prediction_service', 
+        'serving.services.mlflow_service',
+        'serving.services.data_service',
         'uvicorn.access',
         'uvicorn.error'
     ]
@@ -70,6 +78,8 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    # 전체 예측 결과처럼 큰 응답을 빠르게 직렬화하도록 orjson 사용 (NumPy 값도 직접 직렬화)
+    default_response_class=ORJSONResponse,
 )
 
 # CORS 설정
@@ -81,82 +91,110 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 시작 배너 출력 여부 (false면 배너 생략, 필수 로그만 출력)
+SHOW_STARTUP_BANNER = os.getenv("SHOW_STARTUP_BANNER", "true").lower() == "true"
+
+def _print_banner(*lines):
+    """장식용 배너를 stderr에 한 번에 출력"""
+    if SHOW_STARTUP_BANNER and lines:
+        print("\n".join(lines), file=sys.stderr, flush=True)
+
 # 전역 예측 서비스 객체
 prediction_service = None
 
+# TMDB 영화 정보 서비스 (최초 요청 시 생성, 영화별 조회 결과를 요청 간에 공유)
+tmdb_service = None
+
+def get_tmdb_service() -> TMDBService:
+    """TMDB 서비스 의존성"""
+    global tmdb_service
+    if tmdb_service is None:
+        tmdb_service = TMDBService()
+    return tmdb_service
+
+async def require_ready() -> SimplePredictionService:
+    """예측 서비스 준비 여부 확인 의존성 (준비 전이면 503)"""
+    if not prediction_service:
+        raise HTTPException(status_code=503, detail="예측 서비스가 아직 준비되지 않았습니다.")
+    
+    if not prediction_service.is_ready:
+        raise HTTPException(status_code=503, detail="예측 서비스가 초기화되지 않았습니다.")
+    
+    return prediction_service
+
 @app.on_event("startup")
 async def startup_event():
     """서버 시작시 예측 서비스 초기화 및 예측 실행"""
     global prediction_service
     
-    logger.info("=" * 80)
-    logger.info("🚀 Movie Rating Prediction FastAPI 서버 시작!")
-    logger.info("=" * 80)
+    _print_banner(
+        "=" * 80,
+        "🚀 Movie Rating Prediction FastAPI 서버 시작!",
+        "=" * 80,
+        "📦 1단계: SimplePredictionService 객체 생성 및 초기화",
+        "🤖 2단계: MLflow Production 모델 & CSV 데이터 로딩",
+        "🎯 3단계: 전체 영화 데이터 예측 실행 (데이터 크기에 따라 몇 초~몇 분 소요)",
+    )
     
     try:
         # 1단계: 예측 서비스 생성 및 초기화
-        logger.info("📦 1단계: SimplePredictionService 객체 생성 중...")
         prediction_service = SimplePredictionService()
-        logger.info("✅ 예측 서비스 객체 생성 완료")
-        
-        logger.info("🤖 2단계: MLflow Production 모델 & CSV 데이터 로딩 중...")
         init_result = prediction_service.initialize()
         
         if not init_result['success']:
-            logger.error(f"❌ 예측 서비스 초기화 실패: {init_result['message']}")
+            logger.error("❌ 예측 서비스 초기화 실패: %s", init_result['message'])
             logger.error("💡 해결 방법:")
             logger.error("   1. MLflow 서버가 실행 중인지 확인: http://localhost:5001")
             logger.error("   2. Production 모델이 등록되어 있는지 확인")
             logger.error("   3. tmdb_test.csv 파일 경로 확인")
             return
         
-        logger.info("✅ 예측 서비스 초기화 완료!")
-        logger.info(f"   🏷️ 모델 버전: {init_result.get('model_version')}")
-        logger.info(f"   📊 로드된 영화 수: {init_result.get('data_count'):,}개")
+        logger.info("✅ 예측 서비스 초기화 완료! 모델 버전: %s", init_result.get('model_version'))
+        logger.info("   📊 로드된 영화 수: %d개", init_result.get('data_count') or 0)
         
         # 2단계: 전체 영화 예측 실행
-        logger.info("🎯 3단계: 전체 영화 데이터 예측 실행 중...")
-        logger.info("   (이 과정은 데이터 크기에 따라 몇 초~몇 분 소요됩니다)")
-        
         pred_result = prediction_service.predict_all()
         
-        if pred_result['success']:
-            logger.info("🎉 전체 예측 완료!")
-            logger.info(f"   📈 예측 완료된 영화: {pred_result['sample_count']:,}개")
-            
-            # 상위 5개 영화 미리보기
-            top_movies = prediction_service.get_top_movies(5)
-            if top_movies['available']:
-                logger.info("🏆 예측 평점 상위 5개 영화 미리보기:")
-                for movie in top_movies['top_movies']:
-                    logger.info(f"   {movie['rank']}위. 영화 ID {movie['movie_id']}: ⭐ {movie['predicted_rating']:.2f}")
-            
-        else:
-            logger.error(f"❌ 예측 실행 실패: {pred_result['message']}")
+        if not pred_result['success']:
+            logger.error("❌ 예측 실행 실패: %s", pred_result['message'])
             return
+        
+        logger.info("🎉 전체 예측 완료! 예측 완료된 영화: %d개", pred_result['sample_count'])
             
         # 최종 서비스 상태 확인
         status = prediction_service.get_status()
-        logger.info("📊 4단계: 서비스 최종 상태 확인")
-        logger.info(f"   서비스 준비: {'✅ 완료' if status['service_ready'] else '❌ 실패'}")
-        logger.info(f"   모델 로드: {'✅ 완료' if status['model_loaded'] else '❌ 실패'}")
-        logger.info(f"   데이터 로드: {'✅ 완료' if status['data_loaded'] else '❌ 실패'}")
-        logger.info(f"   예측 완료: {'✅ 완료' if status['predictions_available'] else '❌ 실패'}")
+        logger.info(
+            "📊 서비스 상태 - 서비스 준비: %s, 모델 로드: %s, 데이터 로드: %s, 예측 완료: %s",
+            *('✅' if status[key] else '❌' for key in
+              ('service_ready', 'model_loaded', 'data_loaded', 'predictions_available'))
+        )
         
-        logger.info("=" * 80)
-        logger.info("🎊 Movie Rating Prediction API 서버 준비 완료!")
-        logger.info("🌐 API 문서: http://localhost:8000/docs")
-        logger.info("📊 Streamlit 대시보드: streamlit run streamlit_app.py")
-        logger.info("=" * 80)
+        if SHOW_STARTUP_BANNER:
+            # 상위 5개 영화 미리보기
+            banner = []
+            top_movies = prediction_service.get_top_movies(5)
+            if top_movies['available']:
+                banner.append("🏆 예측 평점 상위 5개 영화 미리보기:")
+                banner.extend(
+                    f"   {movie['rank']}위. 영화 ID {movie['movie_id']}: ⭐ {movie['predicted_rating']:.2f}"
+                    for movie in top_movies['top_movies']
+                )
+            _print_banner(
+                *banner,
+                "=" * 80,
+                "🎊 Movie Rating Prediction API 서버 준비 완료!",
+                "🌐 API 문서: http://localhost:8000/docs",
+                "📊 Streamlit 대시보드: streamlit run streamlit_app.py",
+                "=" * 80,
+            )
             
     except Exception as e:
         logger.error("=" * 80)
-        logger.error(f"❌ 서버 시작 중 치명적인 오류 발생: {e}")
+        logger.error("❌ 서버 시작 중 치명적인 오류 발생: %s", e)
         logger.error("💡 디버깅 정보:")
-        logger.error(f"   오류 타입: {type(e).__name__}")
-        logger.error(f"   오류 메시지: {str(e)}")
+        logger.error("   오류 타입: %s", type(e).__name__)
+        logger.error("   오류 메시지: %s", e)
         logger.error("=" * 80)
-        import traceback
         logger.error("🔍 상세 오류 정보:")
         logger.error(traceback.format_exc())
 
@@ -180,8 +218,10 @@ async def root():
         "timestamp": datetime.now().isoformat(),
         "endpoints": {
             "health": "/health",
+            "ready": "/ready",
             "predictions": "/predictions", 
             "top_movies": "/top-movies",
+            "movie_details": "/movies/details",
             "statistics": "/stats",
             "service_status": "/predict-status",
             "docs": "/docs"
@@ -218,23 +258,29 @@ async def health_check():
         "message": "영화 평점 예측 서비스 상태"
     }
 
+@app.get("/ready")
+async def readiness_check():
+    """준비 상태 확인 엔드포인트 (모델/데이터 로드와 예측이 끝나기 전에는 503)"""
+    if not prediction_service or not prediction_service.is_ready or not prediction_service.predictions:
+        raise HTTPException(status_code=503, detail="예측 서비스가 아직 준비되지 않았습니다.")
+    
+    return {
+        "status": "ready",
+        "timestamp": datetime.now().isoformat(),
+        "model_version": prediction_service.mlflow_service.model_version
+    }
+
 # 예측 관련 엔드포인트
 @app.get("/predictions")
-async def get_all_predictions():
+async def get_all_predictions(service: SimplePredictionService = Depends(require_ready)):
     """전체 예측 결과 조회"""
-    if not prediction_service:
-        raise HTTPException(status_code=503, detail="예측 서비스가 아직 준비되지 않았습니다.")
-    
-    if not prediction_service.is_ready:
-        raise HTTPException(status_code=503, detail="예측 서비스가 초기화되지 않았습니다.")
-    
     try:
-        predictions = prediction_service.get_predictions()
+        predictions = service.get_predictions()
         
         if not predictions['available']:
             raise HTTPException(status_code=404, detail="예측 결과를 찾을 수 없습니다.")
         
-        logger.info(f"📊 예측 결과 조회: {predictions['sample_count']:,}개")
+        logger.info("📊 예측 결과 조회: %d개", predictions['sample_count'])
         
         return {
             "success": True,
@@ -249,25 +295,23 @@ async def get_all_predictions():
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ 예측 결과 조회 실패: {e}")
+        logger.error("❌ 예측 결과 조회 실패: %s", e)
         raise HTTPException(status_code=500, detail=f"예측 결과 조회 실패: {str(e)}")
 
 @app.get("/top-movies")
-async def get_top_movies(limit: int = Query(default=10, ge=1, le=50, description="상위 몇 개 영화를 가져올지")):
+async def get_top_movies(
+    limit: int = Query(default=10, ge=1, le=50, description="상위 몇 개 영화를 가져올지"),
+    service: SimplePredictionService = Depends(require_ready),
+):
     """예측 평점 상위 영화 조회"""
-    if not prediction_service:
-        raise HTTPException(status_code=503, detail="예측 서비스가 아직 준비되지 않았습니다.")
-    
-    if not prediction_service.is_ready:
-        raise HTTPException(status_code=503, detail="예측 서비스가 초기화되지 않았습니다.")
-    
     try:
-        top_movies = prediction_service.get_top_movies(limit)
+        # 서비스가 예측 시 미리 계산해 둔 상위 영화 목록을 잘라서 사용
+        top_movies = service.get_top_movies(limit)
         
         if not top_movies['available']:
             raise HTTPException(status_code=404, detail="예측 결과를 찾을 수 없습니다.")
         
-        logger.info(f"🏆 상위 {limit}개 영화 조회")
+        logger.info("🏆 상위 %d개 영화 조회", limit)
         
         return {
             "success": True,
@@ -283,20 +327,45 @@ async def get_top_movies(limit: int = Query(default=10, ge=1, le=50, description
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ 상위 영화 조회 실패: {e}")
+        logger.error("❌ 상위 영화 조회 실패: %s", e)
         raise HTTPException(status_code=500, detail=f"상위 영화 조회 실패: {str(e)}")
 
-@app.get("/stats")
-async def get_prediction_statistics():
-    """예측 통계 정보 조회"""
-    if not prediction_service:
-        raise HTTPException(status_code=503, detail="예측 서비스가 아직 준비되지 않았습니다.")
+@app.get("/movies/details")
+def get_movie_details(
+    ids: str = Query(..., description="쉼표로 구분한 TMDB 영화 ID 목록 (최대 50개)"),
+    service: TMDBService = Depends(get_tmdb_service),
+):
+    """여러 영화의 TMDB 상세 정보를 한 번에 조회 (서버에서 병렬 조회 + 영화별 캐시)"""
+    try:
+        movie_ids = [int(movie_id) for movie_id in ids.split(",") if movie_id.strip()]
+    except ValueError:
+        raise HTTPException(status_code=422, detail="영화 ID는 쉼표로 구분한 정수여야 합니다.")
     
-    if not prediction_service.is_ready:
-        raise HTTPException(status_code=503, detail="예측 서비스가 초기화되지 않았습니다.")
+    if not 1 <= len(movie_ids) <= 50:
+        raise HTTPException(status_code=422, detail="영화 ID는 1~50개까지 조회할 수 있습니다.")
+    
+    if not service.is_available:
+        raise HTTPException(status_code=503, detail="TMDB API 키가 설정되지 않았습니다.")
+    
+    # 동기 함수로 선언해 스레드풀에서 실행 (TMDB 네트워크 대기 중 이벤트 루프를 막지 않음)
+    details = service.get_movie_details_many(movie_ids)
+    
+    logger.info("🎬 TMDB 영화 정보 조회: %d개", len(movie_ids))
     
+    return {
+        "success": True,
+        "message": f"{len(movie_ids)}개 영화 상세 정보",
+        "timestamp": datetime.now().isoformat(),
+        "data": {
+            "details": details
+        }
+    }
+
+@app.get("/stats")
+async def get_prediction_statistics(service: SimplePredictionService = Depends(require_ready)):
+    """예측 통계 정보 조회"""
     try:
-        predictions = prediction_service.get_predictions()
+        predictions = service.get_predictions()
         
         if not predictions['available']:
             raise HTTPException(status_code=404, detail="예측 결과를 찾을 수 없습니다.")
@@ -304,7 +373,6 @@ async def get_prediction_statistics():
         # 통계 계산
         ratings = [result['predicted_rating'] for result in predictions['results']]
         
-        import statistics
         stats = {
             "total_movies": len(ratings),
             "average_rating": round(statistics.mean(ratings), 2),
@@ -338,7 +406,7 @@ async def get_prediction_statistics():
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ 통계 조회 실패: {e}")
+        logger.error("❌ 통계 조회 실패: %s", e)
         raise HTTPException(status_code=500, detail=f"통계 조회 실패: {str(e)}")
 
 @app.get("/predict-status")
@@ -362,14 +430,14 @@ async def get_prediction_service_status():
         }
         
     except Exception as e:
-        logger.error(f"❌ 상태 조회 실패: {e}")
+        logger.error("❌ 상태 조회 실패: %s", e)
         raise HTTPException(status_code=500, detail=f"상태 조회 실패: {str(e)}")
 
 # 개발용 서버 실행 코드
 if __name__ == "__main__":
     logger.info("🎬 Movie Rating Prediction FastAPI 서버 시작")
     uvicorn.run(
-        "main:app",
+        "serving.main:app",
         host="0.0.0.0",
         port=8000,
         reload=False,  # 로깅 안정성을 위해 reload 비활성화
@@ -1,42 +1,21 @@
 import logging
-import os
-
-# .env 파일 로드 (python-dotenv 필요: pip install python-dotenv)
-try:
-    from dotenv import load_dotenv
-    
-    # 여러 경로에서 .env 파일 찾기
-    possible_paths = [
-        ".env",           # 현재 디렉토리
-        "../.env",        # 상위 디렉토리  
-        "../../.env",     # 두 단계 상위 디렉토리
-    ]
-    
-    env_loaded = False
-    for path in possible_paths:
-        if load_dotenv(dotenv_path=path):
-            logging.info(f"📁 .env 파일 로드 완료: {path}")
-            env_loaded = True
-            break
-    
-    if not env_loaded:
-        logging.warning("⚠️ .env 파일을 찾을 수 없음")
-    
-except ImportError:
-    logging.warning("⚠️ python-dotenv가 설치되지 않음. 환경변수를 직접 설정하세요.")
-    logging.warning("💡 설치 방법: pip install python-dotenv")
-except Exception as e:
-    logging.warning(f"⚠️ .env 파일 로드 실패: {e}")
+from concurrent.futures import ThreadPoolExecutor
 
 # 로깅 설정 - 콘솔에 정보를 출력하도록 설정
-logging.basicConfig(
-    level=logging.INFO,  # INFO 레벨 이상만 출력 (DEBUG는 출력 안함)
-    format="%(asctime)s - %(levelname)s - %(message)s"  # 시간 - 레벨 - 메시지 형식
-)
+# (uvicorn/pytest 등이 이미 핸들러를 설정했다면 그 설정을 그대로 사용)
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        level=logging.INFO,  # INFO 레벨 이상만 출력 (DEBUG는 출력 안함)
+        format="%(asctime)s - %(levelname)s - %(message)s"  # 시간 - 레벨 - 메시지 형식
+    )
 logger = logging.getLogger(__name__)  # 현재 모듈명으로 로거 생성
 
+# .env 파일 로드 (프로세스당 1회, SKIP_DOTENV=1이면 생략)
+from serving.services.env_loader import load_env
+load_env()
+
 # MLflow 서비스 import
-from services.mlflow_service import MLflowModelService
+from serving.services.mlflow_service import MLflowModelService
 
 class MoviePredictionService:
     """
@@ -88,14 +67,16 @@ class MoviePredictionService:
         """
         logger.info("🔍 서비스 상태 확인 중...")
         
-        # MLflow 연결 상태 확인
-        mlflow_connection = self.mlflow_service.check_mlflow_connection()
-        
-        # Production 모델 존재 여부 확인
-        production_model = self.mlflow_service.check_production_model_exists()
-        
-        # 모델 로드 상태 확인
-        model_info = self.mlflow_service.get_model_info()
+        # 세 가지 확인은 서로 독립적인 MLflow 호출이므로 동시에 실행
+        # (전체 소요 시간: 세 호출의 합 → 가장 느린 호출 하나)
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            connection_future = executor.submit(self.mlflow_service.check_mlflow_connection)    # MLflow 연결 상태
+            production_future = executor.submit(self.mlflow_service.check_production_model_exists)  # Production 모델 존재 여부
+            model_info_future = executor.submit(self.mlflow_service.get_model_info)             # 모델 로드 상태
+            
+            mlflow_connection = connection_future.result()
+            production_model = production_future.result()
+            model_info = model_info_future.result()
         
         # 전체 상태 구성
         health_status = {
@@ -234,7 +215,7 @@ def show_mlflow_setup_guide():
     print("   Models 탭에서 Production 스테이지 모델 확인")
     
     print("\n📝 5. 테스트 실행:")
-    print("   python movie_service.py")
+    print("   python -m serving.movie_service")
 
 # 이 파일을 직접 실행할 때만 테스트 함수 실행
 if __name__ == "__main__":
@@ -243,18 +224,18 @@ if __name__ == "__main__":
     # 🎯 명령행 인수로 다양한 옵션 제공
     if len(sys.argv) > 1:
         if sys.argv[1] == "test":
-            # python movie_service.py test
+            # python -m serving.movie_service test
             test_step1_mlflow()
         elif sys.argv[1] == "help":
-            # python movie_service.py help
+            # python -m serving.movie_service help
             show_mlflow_setup_guide()
         else:
             print("사용법:")
-            print("  python movie_service.py       # 1단계 MLflow 테스트 실행")
-            print("  python movie_service.py test  # 1단계 MLflow 테스트 실행")
-            print("  python movie_service.py help  # MLflow 설정 가이드")
+            print("  python -m serving.movie_service       # 1단계 MLflow 테스트 실행")
+            print("  python -m serving.movie_service test  # 1단계 MLflow 테스트 실행")
+            print("  python -m serving.movie_service help  # MLflow 설정 가이드")
     else:
-        # python movie_service.py (기본 실행)
+        # python -m serving.movie_service (기본 실행)
         print("🚀 MLflow 기반 1단계 테스트를 시작합니다...")
-        print("MLflow 설정이 필요하다면: python movie_service.py help\n")
+        print("MLflow 설정이 필요하다면: python -m serving.movie_service help\n")
         test_step1_mlflow()
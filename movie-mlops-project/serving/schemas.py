@@ -3,9 +3,38 @@
 Pydantic 모델을 사용하여 입력/출력 데이터 구조와 검증 규칙을 정의합니다.
 """
 
-from pydantic import BaseModel, Field
+import time
+from pydantic import BaseModel, ConfigDict, Field, computed_field, model_validator
 from typing import Optional, List
-from datetime import datetime
+from datetime import datetime, timezone
+
+
+def ns_to_isoformat(timestamp_ns: int) -> str:
+    """epoch 나노초(int)를 UTC ISO-8601 문자열로 변환 (응답 직렬화 시점에만 사용)"""
+    return datetime.fromtimestamp(timestamp_ns / 1e9, tz=timezone.utc).isoformat()
+
+
+def legacy_timestamp_to_ns(data, old_name: str, new_name: str):
+    """
+    이전 필드명(datetime 또는 ISO 문자열 시각)으로 들어온 값을 epoch 나노초 필드로 변환
+    
+    이전 이름으로 넘긴 시각이 무시되고 현재 시각으로 바뀌지 않도록 입력 검증 전에 옮겨 담습니다.
+    (시간대 정보가 없는 시각은 서버 로컬 시각으로 해석)
+    """
+    if not isinstance(data, dict) or old_name not in data:
+        return data
+    
+    data = dict(data)
+    value = data.pop(old_name)
+    if new_name in data:
+        raise ValueError(f"{old_name}와 {new_name}는 함께 지정할 수 없습니다.")
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if not isinstance(value, datetime):
+        raise ValueError(f"{old_name}는 datetime 또는 ISO-8601 문자열이어야 합니다.")
+    
+    data[new_name] = int(value.timestamp() * 1_000_000) * 1000
+    return data
 
 
 class MovieInput(BaseModel):
@@ -14,31 +43,34 @@ class MovieInput(BaseModel):
     TMDb API에서 가져올 수 있는 주요 영화 정보들을 포함합니다.
     """
     
+    # 문자열 앞뒤 공백 제거 (pydantic-core에서 검증과 함께 처리)
+    model_config = ConfigDict(str_strip_whitespace=True)
+    
     # 기본 정보
     title: str = Field(
         ...,  # 필수 필드
         description="영화 제목",
-        example="아바타: 물의 길"
+        examples=["아바타: 물의 길"]
     )
     
     overview: Optional[str] = Field(
         None,  # 선택적 필드
         description="영화 줄거리/개요",
-        example="판도라 행성에서 펼쳐지는 제이크 설리 가족의 모험..."
+        examples=["판도라 행성에서 펼쳐지는 제이크 설리 가족의 모험..."]
     )
     
     # 장르 정보
     genres: Optional[List[str]] = Field(
         None,
         description="영화 장르 목록",
-        example=["액션", "어드벤처", "SF"]
+        examples=[["액션", "어드벤처", "SF"]]
     )
     
     # 제작 정보
     runtime: Optional[int] = Field(
         None,
         description="상영 시간 (분)",
-        example=192,
+        examples=[192],
         ge=1,  # 1분 이상
         le=500  # 500분 이하 (현실적 범위)
     )
@@ -46,7 +78,7 @@ class MovieInput(BaseModel):
     budget: Optional[float] = Field(
         None,
         description="제작비 (달러)",
-        example=350000000.0,
+        examples=[350000000.0],
         ge=0  # 0 이상
     )
     
@@ -54,14 +86,14 @@ class MovieInput(BaseModel):
     release_date: Optional[str] = Field(
         None,
         description="개봉일 (YYYY-MM-DD 형식)",
-        example="2022-12-14"
+        examples=["2022-12-14"]
     )
     
     # 인기도/점수 관련
     popularity: Optional[float] = Field(
         None,
         description="TMDb 인기도 점수",
-        example=2547.815,
+        examples=[2547.815],
         ge=0
     )
     
@@ -69,26 +101,26 @@ class MovieInput(BaseModel):
     director: Optional[str] = Field(
         None,
         description="감독명",
-        example="제임스 카메론"
+        examples=["제임스 카메론"]
     )
     
     production_companies: Optional[List[str]] = Field(
         None,
         description="제작사 목록",
-        example=["20th Century Studios", "Lightstorm Entertainment"]
+        examples=[["20th Century Studios", "Lightstorm Entertainment"]]
     )
     
     # 언어/지역 정보
     original_language: Optional[str] = Field(
         None,
         description="원본 언어 코드",
-        example="en"
+        examples=["en"]
     )
     
     production_countries: Optional[List[str]] = Field(
         None,
         description="제작 국가 목록",
-        example=["US"]
+        examples=[["US"]]
     )
 
 
@@ -102,7 +134,7 @@ class PredictionResult(BaseModel):
     predicted_rating: float = Field(
         ...,
         description="예측된 평점 (0-10 범위)",
-        example=7.8,
+        examples=[7.8],
         ge=0,
         le=10
     )
@@ -111,7 +143,7 @@ class PredictionResult(BaseModel):
     confidence: Optional[float] = Field(
         None,
         description="예측 신뢰도 (0-1 범위)",
-        example=0.85,
+        examples=[0.85],
         ge=0,
         le=1
     )
@@ -120,24 +152,36 @@ class PredictionResult(BaseModel):
     model_version: str = Field(
         ...,
         description="사용된 모델 버전",
-        example="v1.0.0"
+        examples=["v1.0.0"]
     )
     
-    prediction_timestamp: datetime = Field(
-        ...,
-        description="예측 수행 시각",
-        example="2024-01-15T10:30:00"
+    # 시각은 int(epoch 나노초)로 보관하고 ISO 문자열은 직렬화할 때만 생성
+    prediction_timestamp_ns: int = Field(
+        default_factory=time.time_ns,
+        description="예측 수행 시각 (epoch 나노초)",
+        examples=[1705314600000000000]
     )
     
+    @model_validator(mode='before')
+    @classmethod
+    def _accept_legacy_timestamp(cls, data):
+        """이전 필드명 prediction_timestamp(datetime)로 넘긴 시각도 그대로 사용"""
+        return legacy_timestamp_to_ns(data, 'prediction_timestamp', 'prediction_timestamp_ns')
+    
+    @computed_field(description="예측 수행 시각 (UTC ISO-8601)", examples=["2024-01-15T10:30:00+00:00"])
+    @property
+    def prediction_timestamp(self) -> str:
+        return ns_to_isoformat(self.prediction_timestamp_ns)
+    
     # 입력 데이터 요약
     input_summary: dict = Field(
         ...,
         description="예측에 사용된 입력 데이터 요약",
-        example={
+        examples=[{
             "title": "아바타: 물의 길",
             "genres": ["액션", "어드벤처", "SF"],
             "runtime": 192
-        }
+        }]
     )
 
 
@@ -150,13 +194,13 @@ class PredictionResponse(BaseModel):
     success: bool = Field(
         ...,
         description="예측 성공 여부",
-        example=True
+        examples=[True]
     )
     
     message: str = Field(
         ...,
         description="응답 메시지",
-        example="예측이 성공적으로 완료되었습니다."
+        examples=["예측이 성공적으로 완료되었습니다."]
     )
     
     data: Optional[PredictionResult] = Field(
@@ -167,10 +211,10 @@ class PredictionResponse(BaseModel):
     error_details: Optional[dict] = Field(
         None,
         description="오류 상세 정보 (실패시에만 포함)",
-        example={
+        examples=[{
             "error_type": "ValidationError",
             "error_message": "필수 필드가 누락되었습니다."
-        }
+        }]
     )
 
 
@@ -182,22 +226,33 @@ class HealthResponse(BaseModel):
     status: str = Field(
         ...,
         description="서버 상태",
-        example="healthy"
+        examples=["healthy"]
     )
     
-    timestamp: datetime = Field(
-        ...,
-        description="응답 시각"
+    timestamp_ns: int = Field(
+        default_factory=time.time_ns,
+        description="응답 시각 (epoch 나노초)"
     )
     
+    @model_validator(mode='before')
+    @classmethod
+    def _accept_legacy_timestamp(cls, data):
+        """이전 필드명 timestamp(datetime)로 넘긴 시각도 그대로 사용"""
+        return legacy_timestamp_to_ns(data, 'timestamp', 'timestamp_ns')
+    
+    @computed_field(description="응답 시각 (UTC ISO-8601)")
+    @property
+    def timestamp(self) -> str:
+        return ns_to_isoformat(self.timestamp_ns)
+    
     version: str = Field(
         ...,
         description="API 버전",
-        example="0.1.0"
+        examples=["0.1.0"]
     )
     
     model_status: Optional[str] = Field(
         None,
         description="ML 모델 상태",
-        example="loaded"
+        examples=["loaded"]
     )
\ No newline at end of file
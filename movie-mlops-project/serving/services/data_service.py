@@ -1,11 +1,95 @@
 import os          # 파일 시스템 작업 (파일 존재 확인, 경로 처리)
 import logging     # 로그 출력 (정보, 경고, 에러 메시지)
-import pandas as pd # CSV 파일 읽기 및 데이터 처리
-import numpy as np  # 수치 계산 및 배열 처리
+import tempfile    # 캐시 파일 원자적 저장용 임시 파일
+import time        # 파일 확인 결과 캐시 시각 (monotonic)
+from importlib.util import find_spec  # 선택 의존성 설치 여부 확인
+
+# pandas(CSV 파일 읽기 및 데이터 처리)와 numpy(수치 계산 및 배열 처리)는
+# import 비용이 커서 데이터를 실제로 다루는 메소드 안에서 import
+
+# pyarrow가 설치되어 있으면 pyarrow.csv 멀티스레드 블록 단위 파서 사용, 없으면 pandas 기본(C) 엔진
+HAS_PYARROW = find_spec("pyarrow") is not None
+
+# pyarrow.csv 블록 크기 (블록 단위로 나눠 여러 스레드가 동시에 파싱)
+CSV_BLOCK_SIZE = 8 * 1024 * 1024
+
+# polars(Rust 멀티스레드 CSV 파서)가 있으면 우선 사용 - pandas 변환에 pyarrow 필요
+USE_POLARS = HAS_PYARROW and find_spec("polars") is not None
 
 # 로깅 설정 - 이 모듈의 로거 생성
 logger = logging.getLogger(__name__)
 
+# 기본 CSV 파일 절대 경로 - 현재 파일(data_service.py)의 위치를 기준으로 1회 계산
+_SERVICES_DIR = os.path.dirname(os.path.abspath(__file__))   # services/
+_SERVING_DIR = os.path.dirname(_SERVICES_DIR)                 # serving/
+_PROJECT_DIR = os.path.dirname(_SERVING_DIR)                  # movie-mlops-project/
+_DEFAULT_CSV_PATH = os.path.join(_PROJECT_DIR, "preprocessing", "result", "tmdb_test.csv")
+
+# 예상 데이터 스키마 (컬럼명 → CSV 로드 타입) - 검증과 타입 지정이 함께 쓰는 단일 정의
+# - 어떤 컬럼들이 있어야 하는지 미리 정의 (실제 데이터와 비교해서 일치하는지 확인)
+# - 타입을 지정해 pandas/polars의 타입 추론 단계를 생략하고 메모리 절약
+#   (0/1 플래그: int8 / 인코딩 값: int32 / 스케일링 값, 평점: float32)
+_COLUMN_DTYPES = {
+    # 영화 기본 정보
+    'id': 'int64',                          # 영화 고유 ID
+    
+    # 출시 시기 관련 (원-핫 인코딩)
+    'is_summer_release': 'int8',            # 여름 출시 여부 (0 또는 1)
+    'is_holiday_release': 'int8',           # 휴일 출시 여부 (0 또는 1)
+    'is_spring_release': 'int8',            # 봄 출시 여부 (0 또는 1)
+    
+    # 장르 관련 (원-핫 인코딩)
+    'is_action': 'int8', 'is_adventure': 'int8', 'is_animation': 'int8', 'is_comedy': 'int8',
+    'is_crime': 'int8', 'is_documentary': 'int8', 'is_drama': 'int8', 'is_family': 'int8',
+    'is_fantasy': 'int8', 'is_history': 'int8', 'is_horror': 'int8', 'is_music': 'int8',
+    'is_mystery': 'int8', 'is_romance': 'int8', 'is_science_fiction': 'int8',
+    'is_thriller': 'int8', 'is_war': 'int8', 'is_western': 'int8',
+    
+    # 언어 관련
+    'is_english': 'int8', 'is_korean': 'int8', 'is_non_english': 'int8',
+    
+    # 영화 속성
+    'is_adult': 'int8',                     # 성인 영화 여부
+    'has_overview': 'int8', 'has_poster': 'int8', 'has_backdrop': 'int8',  # 컨텐츠 존재 여부
+    
+    # 수치형 특성들 (스케일링된 값)
+    'popularity_scaled': 'float32',         # 인기도 (정규화된 값)
+    'vote_count_scaled': 'float32',         # 투표 수 (정규화된 값)
+    'release_year_scaled': 'float32',       # 출시 연도 (정규화된 값)
+    'release_month_scaled': 'float32',      # 출시 월 (정규화된 값)
+    'release_quarter_scaled': 'float32',    # 출시 분기 (정규화된 값)
+    'movie_age_scaled': 'float32',          # 영화 나이 (정규화된 값)
+    'primary_genre_scaled': 'float32',      # 주 장르 (정규화된 값)
+    'genre_count_scaled': 'float32',        # 장르 개수 (정규화된 값)
+    'log_popularity_scaled': 'float32',     # 로그 인기도 (정규화된 값)
+    'log_vote_count_scaled': 'float32',     # 로그 투표수 (정규화된 값)
+    'vote_efficiency_scaled': 'float32',    # 투표 효율성 (정규화된 값)
+    'title_length_scaled': 'float32',       # 제목 길이 (정규화된 값)
+    'title_word_count_scaled': 'float32',   # 제목 단어 수 (정규화된 값)
+    'overview_length_scaled': 'float32',    # 개요 길이 (정규화된 값)
+    
+    # 인코딩된 특성들
+    'backdrop_path_encoded': 'int32',       # 배경 이미지 경로 (인코딩된 값)
+    'genre_ids_encoded': 'int32',           # 장르 ID (인코딩된 값)
+    'original_language_encoded': 'int32',   # 원본 언어 (인코딩된 값)
+    'original_title_encoded': 'int32',      # 원본 제목 (인코딩된 값)
+    'overview_encoded': 'int32',            # 개요 (인코딩된 값)
+    'poster_path_encoded': 'int32',         # 포스터 경로 (인코딩된 값)
+    'title_encoded': 'int32',               # 제목 (인코딩된 값)
+    'rating_tier_encoded': 'int32',         # 평점 구간 (인코딩된 값)
+    'popularity_tier_encoded': 'int32',     # 인기도 구간 (인코딩된 값)
+    
+    # 타겟 변수 (예측할 값)
+    'vote_average': 'float32',              # 실제 평점 (예측 대상)
+}
+
+# 컬럼 순서 (모든 DataService 인스턴스가 공유하는 불변 튜플)
+_EXPECTED_COLUMNS = tuple(_COLUMN_DTYPES)
+
+# 컬럼 검증용 집합 (포함 여부 확인을 O(1)로)
+_EXPECTED_COLUMN_SET = frozenset(_EXPECTED_COLUMNS)
+
+
 class DataService:
     """
     CSV 데이터 로드 및 전처리 서비스 클래스
@@ -15,6 +99,15 @@ class DataService:
     3. 모델이 사용할 수 있는 형태로 데이터 변환
     4. 데이터에 문제가 있으면 에러 처리
     """
+    
+    # 예상 데이터 스키마 (검증용) - 클래스 속성으로 모든 인스턴스가 공유
+    COLUMN_DTYPES = _COLUMN_DTYPES              # 컬럼명 → CSV 로드 타입
+    EXPECTED_COLUMNS = _EXPECTED_COLUMNS        # 컬럼 순서 (tuple)
+    EXPECTED_COLUMN_SET = _EXPECTED_COLUMN_SET  # 포함 여부 확인용 (frozenset)
+    
+    # 파일 확인 결과 캐시 유지 시간 (초) - 짧은 간격의 반복 확인은 stat 없이 응답
+    FILE_CHECK_TTL = 5
+    
     def __init__(self, csv_path=None):
         """
         DataService 객체 초기화 함수
@@ -29,15 +122,14 @@ class DataService:
         
         # === 1. CSV 파일 경로 설정 ===
         if csv_path is None:
-            # 현재 파일(data_service.py)의 위치를 기준으로 계산
-            current_dir = os.path.dirname(os.path.abspath(__file__))  # services/
-            serving_dir = os.path.dirname(current_dir)                # serving/
-            project_dir = os.path.dirname(serving_dir)                # movie-mlops-project/
-        
-            # CSV 파일 절대 경로 계산
-            self.csv_path = os.path.join(project_dir, "preprocessing", "result", "tmdb_test.csv")
+            # 기본 경로 (모듈 로드 시 1회 계산)
+            self.csv_path = _DEFAULT_CSV_PATH
         else:
-            self.csv_path = csv_path
+            # 생성 시점에 절대 경로로 고정 (이후 작업 디렉토리가 바뀌어도 동일한 파일 사용)
+            self.csv_path = os.path.abspath(csv_path)
+        
+        # CSV를 한 번 파싱한 결과를 저장해 두는 Feather 캐시 (다음 실행부터 mmap으로 로드)
+        self.feather_path = os.path.splitext(self.csv_path)[0] + ".feather"
         
         # === 2. 데이터 상태를 추적하는 변수들 ===
         self.data = None                    # 로드된 pandas DataFrame 저장소
@@ -45,73 +137,22 @@ class DataService:
         self.data_shape = None              # 데이터 크기 (행 수, 열 수)
         self.data_columns = None            # 컬럼 이름 목록
         self.data_info = {}                 # 데이터 메타정보 (통계, 타입 등)
+        self.feature_columns = None         # 모델 입력 특성 컬럼 목록 (타겟 제외)
+        self.feature_matrix = None          # 모델 입력용 float32 C-연속 배열
+        self.targets = None                 # 실제 평점 (vote_average) float32 배열
+        self.movie_ids = None               # 영화 ID int64 배열 (예측 결과 매핑용)
+        self._reordered_features = None     # (특성 순서, 재배열된 배열) 캐시
+        self._file_check_cache = None       # (확인 시각, check_file_exists 결과) 캐시
         
-        # === 3. 예상 데이터 스키마 (검증용) ===
-        # - 어떤 컬럼들이 있어야 하는지 미리 정의
-        # - 실제 데이터와 비교해서 일치하는지 확인
-        self.expected_columns = [
-            # 영화 기본 정보
-            'id',                           # 영화 고유 ID
-            
-            # 출시 시기 관련 (원-핫 인코딩)
-            'is_summer_release',            # 여름 출시 여부 (0 또는 1)
-            'is_holiday_release',           # 휴일 출시 여부 (0 또는 1)  
-            'is_spring_release',            # 봄 출시 여부 (0 또는 1)
-            
-            # 장르 관련 (원-핫 인코딩)
-            'is_action', 'is_adventure', 'is_animation', 'is_comedy',
-            'is_crime', 'is_documentary', 'is_drama', 'is_family',
-            'is_fantasy', 'is_history', 'is_horror', 'is_music',
-            'is_mystery', 'is_romance', 'is_science_fiction',
-            'is_thriller', 'is_war', 'is_western',
-            
-            # 언어 관련
-            'is_english', 'is_korean', 'is_non_english',
-            
-            # 영화 속성
-            'is_adult',                     # 성인 영화 여부
-            'has_overview', 'has_poster', 'has_backdrop',  # 컨텐츠 존재 여부
-            
-            # 수치형 특성들 (스케일링된 값)
-            'popularity_scaled',            # 인기도 (정규화된 값)
-            'vote_count_scaled',            # 투표 수 (정규화된 값)
-            'release_year_scaled',          # 출시 연도 (정규화된 값)
-            'release_month_scaled',         # 출시 월 (정규화된 값)
-            'release_quarter_scaled',       # 출시 분기 (정규화된 값)
-            'movie_age_scaled',             # 영화 나이 (정규화된 값)
-            'primary_genre_scaled',         # 주 장르 (정규화된 값)
-            'genre_count_scaled',           # 장르 개수 (정규화된 값)
-            'log_popularity_scaled',        # 로그 인기도 (정규화된 값)
-            'log_vote_count_scaled',        # 로그 투표수 (정규화된 값)
-            'vote_efficiency_scaled',       # 투표 효율성 (정규화된 값)
-            'title_length_scaled',          # 제목 길이 (정규화된 값)
-            'title_word_count_scaled',      # 제목 단어 수 (정규화된 값)
-            'overview_length_scaled',       # 개요 길이 (정규화된 값)
-            
-            # 인코딩된 특성들
-            'backdrop_path_encoded',        # 배경 이미지 경로 (인코딩된 값)
-            'genre_ids_encoded',            # 장르 ID (인코딩된 값)
-            'original_language_encoded',    # 원본 언어 (인코딩된 값)
-            'original_title_encoded',       # 원본 제목 (인코딩된 값)
-            'overview_encoded',             # 개요 (인코딩된 값)
-            'poster_path_encoded',          # 포스터 경로 (인코딩된 값)
-            'title_encoded',                # 제목 (인코딩된 값)
-            'rating_tier_encoded',          # 평점 구간 (인코딩된 값)
-            'popularity_tier_encoded',      # 인기도 구간 (인코딩된 값)
-            
-            # 타겟 변수 (예측할 값)
-            'vote_average'                   # 실제 평점 (예측 대상)
-        ]
-        
-        # === 4. 초기화 완료 로그 ===
+        # === 3. 초기화 완료 로그 ===
         logger.info("✅ DataService 초기화 완료")
-        logger.info(f"   📁 CSV 경로: {self.csv_path}")
-        logger.info(f"   🏷️ 예상 컬럼 수: {len(self.expected_columns)}개")
+        logger.info("   📁 CSV 경로: %s", self.csv_path)
+        logger.info("   🏷️ 예상 컬럼 수: %d개", len(self.EXPECTED_COLUMNS))
         
         
     def check_file_exists(self):
         """
-        CSV 파일 존재 여부 확인 함수
+        CSV 파일 존재 여부 확인 함수 (FILE_CHECK_TTL 동안 결과 재사용)
         
         Returns:
             dict: 파일 존재 여부와 관련 정보
@@ -122,35 +163,31 @@ class DataService:
                     'file_size': 바이트수          # 파일 크기
                 }
         """
+        # FILE_CHECK_TTL 이내에 확인한 결과가 있으면 그대로 반환
+        now = time.monotonic()
+        if self._file_check_cache and now - self._file_check_cache[0] < self.FILE_CHECK_TTL:
+            return self._file_check_cache[1]
+        
+        result = self._stat_csv_file()
+        self._file_check_cache = (now, result)
+        return result
+        
+        
+    def _stat_csv_file(self):
+        """check_file_exists의 실제 확인 로직 (os.stat 1회)"""
         try:
             # === 1. 로그 출력 (디버깅용) ===
-            logger.info(f"🔍 CSV 파일 존재 확인: {self.csv_path}")
+            logger.info("🔍 CSV 파일 존재 확인: %s", self.csv_path)
             
-            # === 2. 상대 경로를 절대 경로로 변환 ===
-            abs_path = os.path.abspath(self.csv_path)
+            # === 2. 절대 경로 (생성 시점에 이미 변환됨) ===
+            abs_path = self.csv_path
             
-            # === 3. 파일 존재 여부 확인 ===
-            if os.path.exists(abs_path):
-                # 파일이 존재하는 경우
-                
-                # 파일 크기 확인 (바이트 단위)
-                file_size = os.path.getsize(abs_path)
-                
-                # 성공 로그 출력
-                logger.info("✅ CSV 파일 존재 확인!")
-                logger.info(f"   📁 절대 경로: {abs_path}")
-                logger.info(f"   📦 파일 크기: {file_size:,} bytes ({file_size/1024/1024:.2f} MB)")
-                
-                # 성공 결과 반환
-                return {
-                    'exists': True,
-                    'message': 'CSV 파일이 존재합니다.',
-                    'file_path': abs_path,
-                    'file_size': file_size
-                }
-            else:
+            # === 3. 파일 존재 여부 + 크기 확인 (stat 1회) ===
+            try:
+                file_size = os.stat(abs_path).st_size  # 파일 크기 (바이트 단위)
+            except FileNotFoundError:
                 # 파일이 존재하지 않는 경우
-                logger.warning(f"⚠️ CSV 파일을 찾을 수 없음: {abs_path}")
+                logger.warning("⚠️ CSV 파일을 찾을 수 없음: %s", abs_path)
                 
                 # 실패 결과 반환
                 return {
@@ -159,14 +196,26 @@ class DataService:
                     'file_path': abs_path,
                     'file_size': None
                 }
+            
+            # 성공 로그 출력
+            logger.info("✅ CSV 파일 존재 확인! 📁 %s, 📦 %d bytes (%.2f MB)",
+                        abs_path, file_size, file_size / 1048576.0)
+            
+            # 성공 결과 반환
+            return {
+                'exists': True,
+                'message': 'CSV 파일이 존재합니다.',
+                'file_path': abs_path,
+                'file_size': file_size
+            }
                 
-        except Exception as e:
-            # === 4. 예외 처리 (예상하지 못한 에러) ===
+        except OSError as e:
+            # === 4. 예외 처리 (파일 시스템 에러) ===
             # - 권한 없음 (Permission denied)
             # - 디스크 오류
             # - 네트워크 드라이브 연결 문제 등
             
-            logger.error(f"❌ 파일 확인 중 오류: {e}")
+            logger.error("❌ 파일 확인 중 오류: %s", e)
             
             return {
                 'exists': False,
@@ -176,13 +225,30 @@ class DataService:
             }
        
             
-    def load_data(self):
+    def load_data(self, compute_duplicates=False):
         """
         CSV 데이터를 pandas DataFrame으로 로드
         
+        Args:
+            compute_duplicates (bool): 중복 행 개수 계산 여부 (전체 행 해싱이 필요한 진단용 지표,
+                                       False면 duplicate_count는 None)
+        
         Returns:
             dict: 로드 결과 {'success': bool, 'message': str, 'data_loaded': bool, ...}
         """
+        # 이미 로드된 경우 CSV를 다시 파싱하지 않고 기존 결과 반환
+        if self.is_data_loaded:
+            logger.info("데이터가 이미 로드되었습니다.")
+            return {
+                'success': True,
+                'message': '데이터가 이미 로드되어 있습니다.',
+                'data_loaded': True,
+                'shape': self.data_shape,
+                'columns_count': len(self.data_columns),
+                'null_count': self.data_info['null_count'],
+                'duplicate_count': self.data_info['duplicate_count']
+            }
+        
         # 파일 존재 확인
         file_check = self.check_file_exists()
         if not file_check['exists']:
@@ -194,22 +260,43 @@ class DataService:
             }
         
         try:
+            import numpy as np
+            
             # CSV 파일 로드
-            logger.info(f"📊 CSV 데이터 로딩 시작...")
-            logger.info(f"   📁 파일: {file_check['file_path']}")
-            logger.info(f"   📦 크기: {file_check['file_size']:,} bytes")
+            logger.info("📊 CSV 데이터 로딩 시작... (📁 %s, 📦 %d bytes)",
+                        file_check['file_path'], file_check['file_size'])
             
-            # pandas로 CSV 읽기 (핵심!)
-            self.data = pd.read_csv(file_check['file_path'])
+            # Feather 캐시가 최신이면 mmap으로 로드, 아니면 CSV 파싱 후 캐시 저장
+            self.data = self._load_feather_cache(file_check['file_path'])
+            if self.data is None:
+                self.data = self._read_csv(file_check['file_path'])
+                self._save_feather_cache()
             
             # 기본 정보 수집
             self.data_shape = self.data.shape                    # (행수, 열수)
             self.data_columns = list(self.data.columns)          # 컬럼명 목록
+            
+            # 스키마 검증 (예상 컬럼 중 누락된 컬럼이 있으면 로드 실패 처리)
+            missing_columns = sorted(self.EXPECTED_COLUMN_SET.difference(self.data_columns))
+            if missing_columns:
+                raise ValueError(f"필수 컬럼 누락: {missing_columns}")
+            
+            # 모델 입력용 특성 행렬 (예측마다 DataFrame 변환하지 않도록 1회 생성)
+            self.feature_columns = [col for col in self.data_columns if col != 'vote_average']
+            self.feature_matrix = self._build_feature_matrix(self.feature_columns)
+            self.targets = self.data['vote_average'].to_numpy(dtype=np.float32)
+            self.movie_ids = self.data['id'].to_numpy(dtype=np.int64)
+            self._reordered_features = None
+            
             self.is_data_loaded = True                           # 로드 완료 플래그
             
             # 데이터 품질 확인
-            null_counts = self.data.isnull().sum().sum()         # 전체 결측치 개수
-            duplicate_counts = self.data.duplicated().sum()      # 중복 행 개수
+            # - 정수 컬럼은 결측치를 가질 수 없으므로 실수 컬럼만 NumPy로 한 번에 검사
+            float_values = self.data.select_dtypes(include='floating').to_numpy()
+            null_counts = int(np.isnan(float_values).sum())     # 전체 결측치 개수
+            duplicate_counts = (                                 # 중복 행 개수 (요청 시에만)
+                int(self.data.duplicated().sum()) if compute_duplicates else None
+            )
             
             # 메타정보 저장
             self.data_info = {
@@ -217,15 +304,16 @@ class DataService:
                 'columns': self.data_columns,
                 'null_count': null_counts,
                 'duplicate_count': duplicate_counts,
-                'dtypes': self.data.dtypes.to_dict()             # 각 컬럼의 데이터 타입
+                'missing_columns': missing_columns,
+                # 각 컬럼의 데이터 타입 ((컬럼명, 타입 문자열) 튜플 - JSON 직렬화 가능)
+                'dtypes': tuple((col, str(dtype)) for col, dtype in self.data.dtypes.items())
             }
             
             # 성공 로그
-            logger.info("✅ CSV 데이터 로드 완료!")
-            logger.info(f"   📊 데이터 크기: {self.data_shape[0]:,} rows × {self.data_shape[1]} columns")
-            logger.info(f"   🏷️ 컬럼 수: {len(self.data_columns)}")
-            logger.info(f"   🔍 결측치: {null_counts:,}개")
-            logger.info(f"   🔍 중복 행: {duplicate_counts:,}개")
+            logger.info("✅ CSV 데이터 로드 완료! 📊 %d rows × %d columns, 🔍 결측치: %d개",
+                        self.data_shape[0], self.data_shape[1], null_counts)
+            if duplicate_counts is not None:
+                logger.info("   🔍 중복 행: %d개", duplicate_counts)
             
             return {
                 'success': True,
@@ -237,15 +325,20 @@ class DataService:
                 'duplicate_count': duplicate_counts
             }
             
-        except Exception as e:
-            # 실패 처리
-            logger.error(f"❌ CSV 데이터 로드 실패: {e}")
+        except (OSError, ValueError) as e:
+            # 실패 처리 (파일 읽기 오류, 파싱/타입 변환 오류, 스키마 불일치)
+            logger.error("❌ CSV 데이터 로드 실패: %s", e)
             
             # 상태 초기화
             self.data = None
             self.is_data_loaded = False
             self.data_shape = None
             self.data_columns = None
+            self.feature_columns = None
+            self.feature_matrix = None
+            self.targets = None
+            self.movie_ids = None
+            self._reordered_features = None
             
             return {
                 'success': False,
@@ -254,6 +347,205 @@ class DataService:
                 'shape': None
             }
             
+
+    def _read_csv(self, csv_path):
+        """
+        CSV 파일을 pandas DataFrame으로 파싱 (필요한 컬럼만, 타입 지정)
+        - 예상 컬럼 외의 컬럼은 파싱하지 않음 (읽는 시점에 컬럼 선택)
+        
+        polars가 설치되어 있으면 polars로, 없으면 pyarrow.csv로 파싱한 뒤 pandas로 변환하고,
+        둘 다 없으면 pandas.read_csv를 사용합니다.
+        """
+        import pandas as pd
+        
+        # 필요한 컬럼만 파싱하므로 헤더를 먼저 확인해 누락 컬럼을 명확한 메시지로 알림
+        header = pd.read_csv(csv_path, nrows=0).columns
+        missing_columns = sorted(self.EXPECTED_COLUMN_SET.difference(header))
+        if missing_columns:
+            raise ValueError(f"필수 컬럼 누락: {missing_columns}")
+        
+        if USE_POLARS:
+            import polars as pl
+            
+            try:
+                pl_df = pl.read_csv(
+                    csv_path,
+                    columns=list(self.EXPECTED_COLUMNS),
+                    schema_overrides={col: getattr(pl, dtype.capitalize()) for col, dtype in self.COLUMN_DTYPES.items()},
+                    rechunk=False
+                )
+            except pl.exceptions.PolarsError as e:
+                # pandas/pyarrow 파서와 같은 예외 종류(ValueError)로 맞춤
+                raise ValueError(f"CSV 파싱 실패: {e}") from e
+            return self._enforce_dtypes(pl_df.to_pandas())
+        
+        if HAS_PYARROW:
+            import pyarrow as pa
+            from pyarrow import csv as pacsv
+            
+            table = pacsv.read_csv(
+                csv_path,
+                read_options=pacsv.ReadOptions(use_threads=True, block_size=CSV_BLOCK_SIZE),
+                convert_options=pacsv.ConvertOptions(
+                    column_types={col: pa.type_for_alias(dtype) for col, dtype in self.COLUMN_DTYPES.items()},
+                    include_columns=list(self.EXPECTED_COLUMNS)
+                )
+            )
+            # 변환하면서 Arrow 버퍼를 바로 해제해 최대 메모리 사용량을 줄임
+            return self._enforce_dtypes(table.to_pandas(self_destruct=True, split_blocks=True))
+        
+        # pandas로 CSV 읽기
+        # - 정수 컬럼은 nullable 타입으로 읽어 결측치 처리를 다른 파서와 같은 검사에 맡김
+        return self._enforce_dtypes(pd.read_csv(
+            csv_path,
+            usecols=self.EXPECTED_COLUMNS,
+            dtype={
+                col: dtype.capitalize() if dtype.startswith('int') else dtype
+                for col, dtype in self.COLUMN_DTYPES.items()
+            }
+        ))
+    
+    
+    def _enforce_dtypes(self, df):
+        """
+        파서와 관계없이 COLUMN_DTYPES 타입으로 맞추기
+        
+        정수 컬럼에 결측치가 있으면 파서마다 결과가 달라지므로(float64 변환 또는 파싱 오류)
+        어떤 파서를 쓰든 결측치가 있는 컬럼 이름과 함께 ValueError를 발생시킵니다.
+        
+        Returns:
+            pd.DataFrame: 모든 컬럼이 COLUMN_DTYPES 타입인 DataFrame
+        """
+        null_int_columns = []
+        for col, dtype in self.COLUMN_DTYPES.items():
+            if str(df[col].dtype) == dtype:
+                continue
+            if dtype.startswith('int') and df[col].isna().any():
+                null_int_columns.append(col)
+                continue
+            df[col] = df[col].astype(dtype)
+        
+        if null_int_columns:
+            raise ValueError(f"정수 컬럼에 결측치가 있습니다: {null_int_columns}")
+        return df
+    
+    
+    def _load_feather_cache(self, csv_path):
+        """
+        CSV보다 최신인 Feather 캐시가 있으면 memory-map으로 읽어 DataFrame 반환
+        
+        Returns:
+            pd.DataFrame | None: 캐시를 쓸 수 없으면 None (CSV를 다시 파싱해야 함)
+        """
+        if not HAS_PYARROW:
+            return None
+        
+        try:
+            if os.stat(self.feather_path).st_mtime < os.stat(csv_path).st_mtime:
+                logger.info("🔄 Feather 캐시가 CSV보다 오래됨 - CSV 다시 파싱")
+                return None
+        except FileNotFoundError:
+            return None
+        
+        try:
+            from pyarrow import feather
+            
+            import pyarrow as pa
+            
+            table = feather.read_table(self.feather_path, memory_map=True)
+            if set(table.column_names) != self.EXPECTED_COLUMN_SET:
+                logger.info("🔄 Feather 캐시 스키마 불일치 - CSV 다시 파싱")
+                return None
+            
+            # 컬럼 타입도 COLUMN_DTYPES와 같아야 사용 (이전 버전이 저장한 캐시 등)
+            schema = table.schema
+            if any(schema.field(col).type != pa.type_for_alias(dtype)
+                   for col, dtype in self.COLUMN_DTYPES.items()):
+                logger.info("🔄 Feather 캐시 컬럼 타입 불일치 - CSV 다시 파싱")
+                return None
+            
+            logger.info("⚡ Feather 캐시 사용: %s", self.feather_path)
+            return table.to_pandas()
+            
+        except (OSError, ValueError) as e:
+            logger.warning("⚠️ Feather 캐시 읽기 실패 (CSV 사용): %s", e)
+            return None
+    
+    
+    def _save_feather_cache(self):
+        """로드한 DataFrame을 Feather(비압축)로 저장 - 실패해도 서비스에는 영향 없음"""
+        if not HAS_PYARROW:
+            return
+        
+        tmp_path = None
+        try:
+            from pyarrow import feather
+            
+            # 같은 디렉토리의 임시 파일에 쓴 뒤 교체 (원자적)
+            # - 여러 워커가 동시에 저장해도 다른 프로세스가 쓰다 만 파일을 읽는 일이 없음
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(self.feather_path), suffix=".feather.tmp"
+            )
+            os.close(fd)
+            feather.write_feather(self.data, tmp_path, compression='uncompressed')
+            os.replace(tmp_path, self.feather_path)
+            tmp_path = None
+            logger.info("💾 Feather 캐시 저장: %s", self.feather_path)
+            
+        except (OSError, ValueError, TypeError) as e:
+            # 읽기 전용 볼륨, 변환 불가 타입 등 - 다음 실행에서도 CSV를 파싱할 뿐
+            logger.warning("⚠️ Feather 캐시 저장 실패: %s", e)
+            
+        finally:
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    
+    def get_feature_matrix(self, feature_names=None):
+        """
+        모델 입력용 특성 행렬 반환
+        
+        Args:
+            feature_names (list, optional): 모델 학습 시 사용된 특성 순서
+                                            CSV 컬럼 순서와 다르면 해당 순서로 재배열
+        
+        Returns:
+            np.ndarray: (영화 수, 특성 수) float32 C-연속 배열, 데이터 미로드 시 None
+        """
+        if not self.is_data_loaded:
+            return None
+        
+        if feature_names is None or list(feature_names) == self.feature_columns:
+            return self.feature_matrix
+        
+        # 재배열 결과는 특성 순서별로 캐시 (모델이 바뀌지 않으면 1회만 계산)
+        key = tuple(feature_names)
+        if self._reordered_features is None or self._reordered_features[0] != key:
+            self._reordered_features = (key, self._build_feature_matrix(key))
+        
+        return self._reordered_features[1]
+    
+    
+    def _build_feature_matrix(self, columns):
+        """
+        지정한 컬럼 순서의 float32 C-연속 특성 행렬 생성
+        
+        결과 배열을 미리 할당하고 컬럼 단위로 채웁니다.
+        (DataFrame 부분 선택 + to_numpy + C-연속 변환처럼 전체 행렬을 여러 번 복사하지 않음)
+        
+        Args:
+            columns (sequence): 특성 컬럼 이름 순서
+        
+        Returns:
+            np.ndarray: (영화 수, 특성 수) float32 C-연속 배열
+        """
+        import numpy as np
+        
+        matrix = np.empty((len(self.data), len(columns)), dtype=np.float32)
+        for j, col in enumerate(columns):
+            matrix[:, j] = self.data[col].to_numpy()
+        return matrix
+            
             
 # =============================================================================
 # 간단한 테스트 함수 (동작 확인용)
@@ -273,7 +565,7 @@ def test_basic_functionality():
     
     # 2. 설정 확인
     print(f"📁 CSV 경로: {service.csv_path}")
-    print(f"🏷️ 예상 컬럼 수: {len(service.expected_columns)}개")
+    print(f"🏷️ 예상 컬럼 수: {len(service.EXPECTED_COLUMNS)}개")
     
     # 3. 파일 존재 확인
     print("\n🔍 파일 존재 확인 중...")
@@ -309,7 +601,8 @@ def test_data_loading():
         print(f"📏 데이터 크기: {result['shape'][0]:,} × {result['shape'][1]}")
         print(f"🏷️ 컬럼 수: {result['columns_count']}")
         print(f"🕳️ 결측치: {result['null_count']}")
-        print(f"🔄 중복 행: {result['duplicate_count']}")
+        if result['duplicate_count'] is not None:
+            print(f"🔄 중복 행: {result['duplicate_count']}")
         
         # 3. 샘플 데이터 미리보기
         print(f"\n👀 첫 5개 컬럼: {service.data_columns[:5]}")
@@ -383,10 +676,10 @@ if __name__ == "__main__":
             debug_file_paths()  # 이제 함수가 정의되어 있음
         else:
             print("사용법:")
-            print("  python data_service.py        # 2차 테스트")
-            print("  python data_service.py 1      # 1차 테스트")
-            print("  python data_service.py 2      # 2차 테스트")
-            print("  python data_service.py test   # 전체 테스트")
-            print("  python data_service.py debug  # 경로 디버깅")
+            print("  python -m serving.services.data_service        # 2차 테스트")
+            print("  python -m serving.services.data_service 1      # 1차 테스트")
+            print("  python -m serving.services.data_service 2      # 2차 테스트")
+            print("  python -m serving.services.data_service test   # 전체 테스트")
+            print("  python -m serving.services.data_service debug  # 경로 디버깅")
     else:
         test_data_loading()
\ No newline at end of file
@@ -0,0 +1,50 @@
+import os
+import logging
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# .env 파일 후보 경로 (앞에서부터 처음 찾은 파일 하나만 로드)
+ENV_FILE_PATHS = (
+    ".env",           # 현재 디렉토리
+    "../.env",        # 상위 디렉토리
+    "../../.env",     # 두 단계 상위 디렉토리
+)
+
+# 프로세스당 한 번만 로드 (여러 모듈이 import 시점에 호출해도 다시 파싱하지 않음)
+_env_loaded = False
+
+
+def load_env():
+    """
+    .env 파일을 환경변수로 로드 (프로세스당 1회)
+    
+    .env 값이 이미 설정된 환경변수보다 우선합니다 (override=True).
+    SKIP_DOTENV=1이면 생략합니다 (컨테이너처럼 환경변수가 이미 주입된 경우).
+    
+    Returns:
+        str: 로드한 .env 파일 경로 (생략했거나 파일이 없으면 None)
+    """
+    global _env_loaded
+    if _env_loaded:
+        return None
+    _env_loaded = True
+    
+    if os.getenv("SKIP_DOTENV") == "1":
+        return None
+    
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        logger.warning("⚠️ python-dotenv가 설치되지 않음. 환경변수를 직접 설정하세요.")
+        return None
+    
+    env_path = next((path for path in ENV_FILE_PATHS if os.path.isfile(path)), None)
+    if env_path is None:
+        logger.warning("⚠️ .env 파일을 찾을 수 없음")
+        return None
+    
+    load_dotenv(dotenv_path=env_path, override=True)
+    # 워커 재시작마다 반복되는 메시지라 DEBUG 레벨로 출력
+    logger.debug("📁 .env 파일 로드 완료: %s", env_path)
+    return env_path
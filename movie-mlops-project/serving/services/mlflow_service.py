@@ -1,35 +1,50 @@
 import os
 import logging
-import mlflow
-import mlflow.xgboost
+import time
+import tempfile
+import threading
 
-# .env 파일 로드
-try:
-    from dotenv import load_dotenv
-    
-    possible_paths = [
-        ".env",
-        "../.env", 
-        "../../.env"
-    ]
-    
-    for path in possible_paths:
-        if os.path.exists(path):
-            load_dotenv(dotenv_path=path, override=True)
-            logging.info(f"📁 .env 파일 로드: {path}")
-            break
-    
-except ImportError:
-    logging.warning("⚠️ python-dotenv가 설치되지 않음")
+from serving.services.env_loader import load_env
+
+# mlflow/numpy는 import 비용이 커서(의존성 트리 전체 로드) 실제로 사용하는 메소드 안에서 import
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
+# .env 파일 로드 (프로세스당 1회, SKIP_DOTENV=1이면 생략)
+load_env()
+
+def _mlflow_errors():
+    """
+    MLflow 호출에서 처리할 예외 종류 (예외가 발생했을 때만 평가되므로 mlflow import도 그때 수행)
+    
+    - MlflowException: 서버 오류 응답, 레지스트리 조회 실패
+    - OSError: 연결 실패/타임아웃 (requests 예외 포함), 아티팩트 파일 오류
+    - ValueError: 잘못된 모델 파일 (XGBoostError 포함)
+    """
+    from mlflow.exceptions import MlflowException
+    return (MlflowException, OSError, ValueError)
+
+def _mask_secret(secret, keep=4):
+    """로그 출력용 비밀값 마스킹 (앞뒤 keep 글자만 노출, 짧은 값은 전체 마스킹)"""
+    if len(secret) <= keep * 2:
+        return "****"
+    return f"{secret[:keep]}***{secret[-keep:]}"
+
 class MLflowModelService:
     """
     MLflow 모델 레지스트리 기반 모델 관리 서비스
     """
     
+    # 연결 확인 결과 캐시 유지 시간 (초) - 헬스체크마다 서버를 조회하지 않도록
+    CONNECTION_CHECK_TTL = 60
+    # 확인 실패 시 마지막 성공 결과를 대신 사용할 수 있는 최대 경과 시간 (초)
+    # - 잠깐의 네트워크 오류로 헬스체크가 흔들리지 않게 하되, 장애가 이어지면 실패로 보고
+    CONNECTION_FAILURE_GRACE = 120
+    
+    # tracking URI별 (확인 시각, 결과) - 인스턴스 간 공유
+    _connection_check_cache = {}
+    
     def __init__(self):
         """MLflow 모델 서비스 초기화"""
         
@@ -40,11 +55,24 @@ class MLflowModelService:
         self.mlflow_tracking_uri = os.getenv("MLFLOW_TRACKING_URI", "http://localhost:5001")
         self.model_registry_name = os.getenv("MODEL_REGISTRY_NAME", "MovieRatingXGBoostModel")
         
+        # 다운로드한 모델 아티팩트를 버전별로 보관하는 로컬 캐시 (재시작 시 S3 재다운로드 생략)
+        self.model_cache_dir = os.getenv(
+            "MODEL_CACHE_DIR", os.path.join(tempfile.gettempdir(), "mlflow_model_cache")
+        )
+        
         # 모델 상태 관리
         self.model = None
         self.is_model_loaded = False
         self.model_version = None
         self.model_uri = None
+        self._n_features = None      # 입력 특성 수 (로드 시 1회 확인)
+        self._is_xgboost = False     # XGBoost sklearn 래퍼 여부 (로드 시 1회 확인)
+        
+        # MLflow 클라이언트 (_setup_mlflow에서 1회 생성 후 모든 조회에 재사용)
+        self._client = None
+        
+        # 모델 로드 잠금 (여러 스레드가 동시에 로드를 요청해도 다운로드/로드는 1번만 수행)
+        self._load_lock = threading.Lock()
         
         # MLflow 설정
         self._setup_mlflow()
@@ -66,61 +94,77 @@ class MLflowModelService:
                 os.environ['AWS_DEFAULT_REGION'] = aws_region
                 
                 logger.info("✅ AWS 자격 증명 설정 완료")
-                logger.info(f"   Access Key: {aws_access_key[:4]}***{aws_access_key[-4:]}")
-                logger.info(f"   Region: {aws_region}")
+                logger.info("   Access Key: %s", _mask_secret(aws_access_key))
+                logger.info("   Region: %s", aws_region)
             else:
                 logger.warning("⚠️ AWS 자격 증명이 .env 파일에 없습니다")
                 
-        except Exception as e:
-            logger.error(f"❌ AWS 자격 증명 설정 실패: {e}")
+        except ValueError as e:
+            logger.error("❌ AWS 자격 증명 설정 실패: %s", e)
             
     def _setup_mlflow(self):
         """MLflow Tracking URI 설정"""
         try:
-            logger.info(f"🔗 MLflow 서버 연결 중: {self.mlflow_tracking_uri}")
+            logger.info("🔗 MLflow 서버 연결 중: %s", self.mlflow_tracking_uri)
             
+            import mlflow
             mlflow.set_tracking_uri(self.mlflow_tracking_uri)
+            self._client = mlflow.MlflowClient(tracking_uri=self.mlflow_tracking_uri)
             
             logger.info("✅ MLflow 서버 연결 완료")
-            logger.info(f"   📋 모델 레지스트리명: {self.model_registry_name}")
+            logger.info("   📋 모델 레지스트리명: %s", self.model_registry_name)
             
-        except Exception as e:
-            logger.error(f"❌ MLflow 서버 연결 실패: {e}")
+        except _mlflow_errors() as e:
+            logger.error("❌ MLflow 서버 연결 실패: %s", e)
             raise
             
     def check_mlflow_connection(self):
-        """MLflow 서버 연결 상태 확인"""
+        """MLflow 서버 연결 상태 확인 (CONNECTION_CHECK_TTL 동안 결과 재사용)"""
+        now = time.monotonic()
+        cached = self._connection_check_cache.get(self.mlflow_tracking_uri)
+        if cached and now - cached[0] < self.CONNECTION_CHECK_TTL:
+            return cached[1]
+        
         try:
             logger.info("🔍 MLflow 서버 연결 확인 중...")
             
-            experiments = mlflow.search_experiments()
+            # 연결 확인만 하면 되므로 실험 1개만 조회 (전체 목록 조회 생략)
+            experiments = self._client.search_experiments(max_results=1)
             
             logger.info("✅ MLflow 서버 연결 성공!")
-            logger.info(f"   📊 등록된 실험 수: {len(experiments)}")
             
-            return {
+            result = {
                 'success': True,
                 'message': 'MLflow 서버에 정상적으로 연결되었습니다.',
                 'tracking_uri': self.mlflow_tracking_uri,
-                'experiments_count': len(experiments)
+                'experiment_found': bool(experiments)  # 실험이 1개 이상 조회되었는지 (연결 확인용으로 1개만 조회)
             }
+            self._connection_check_cache[self.mlflow_tracking_uri] = (now, result)
+            return result
             
-        except Exception as e:
-            logger.error(f"❌ MLflow 서버 연결 실패: {e}")
+        except _mlflow_errors() as e:
+            logger.error("❌ MLflow 서버 연결 실패: %s", e)
             
-            return {
+            # 일시적인 장애로 헬스체크가 실패하지 않도록 최근 성공 결과만 잠시 대신 사용
+            if cached and cached[1]['success'] and now - cached[0] < self.CONNECTION_FAILURE_GRACE:
+                logger.warning("⚠️ 마지막으로 확인된 연결 결과를 사용합니다.")
+                return cached[1]
+            
+            result = {
                 'success': False,
                 'message': f'MLflow 서버 연결 실패: {str(e)}',
                 'tracking_uri': self.mlflow_tracking_uri,
-                'experiments_count': 0
+                'experiment_found': False
             }
+            self._connection_check_cache[self.mlflow_tracking_uri] = (now, result)
+            return result
             
     def check_production_model_exists(self):
         """Production 스테이지 모델 존재 여부 확인"""
         try:
-            logger.info(f"🔍 Production 모델 존재 확인: {self.model_registry_name}")
+            logger.info("🔍 Production 모델 존재 확인: %s", self.model_registry_name)
             
-            client = mlflow.MlflowClient()
+            client = self._client
             
             production_versions = client.get_latest_versions(
                 name=self.model_registry_name,
@@ -131,8 +175,8 @@ class MLflowModelService:
                 latest_version = production_versions[0]
                 
                 logger.info("✅ Production 모델 존재 확인!")
-                logger.info(f"   🏷️ 모델 버전: {latest_version.version}")
-                logger.info(f"   📅 등록 시간: {latest_version.creation_timestamp}")
+                logger.info("   🏷️ 모델 버전: %s", latest_version.version)
+                logger.info("   📅 등록 시간: %s", latest_version.creation_timestamp)
                 
                 return {
                     'exists': True,
@@ -152,8 +196,8 @@ class MLflowModelService:
                     'model_uri': None
                 }
                 
-        except Exception as e:
-            logger.error(f"❌ Production 모델 확인 실패: {e}")
+        except _mlflow_errors() as e:
+            logger.error("❌ Production 모델 확인 실패: %s", e)
             
             return {
                 'exists': False,
@@ -164,63 +208,79 @@ class MLflowModelService:
             }
             
     def load_production_model(self):
-        """Production 스테이지 모델 로드"""
+        """Production 스테이지 모델 로드 (스레드 안전, 이미 로드되었으면 재사용)"""
         
+        # 잠금 없이 먼저 확인 (로드 완료 후 호출은 대기 없이 반환)
         if self.is_model_loaded:
-            logger.info("모델이 이미 로드되었습니다.")
-            return {
-                'success': True,
-                'message': '모델이 이미 로드되어 있습니다.',
-                'model_loaded': True,
-                'model_version': self.model_version
-            }
+            return self._already_loaded_result()
         
-        # MLflow 연결 상태 확인
-        connection_check = self.check_mlflow_connection()
-        if not connection_check['success']:
-            return {
-                'success': False,
-                'message': f"MLflow 연결 실패: {connection_check['message']}",
-                'model_loaded': False,
-                'model_version': None
-            }
+        with self._load_lock:
+            # 잠금을 기다리는 동안 다른 스레드가 로드를 마쳤을 수 있으므로 다시 확인
+            if self.is_model_loaded:
+                return self._already_loaded_result()
+            return self._load_production_model()
+    
+    def _already_loaded_result(self):
+        """이미 로드된 모델에 대한 load_production_model 결과"""
+        logger.info("모델이 이미 로드되었습니다.")
+        return {
+            'success': True,
+            'message': '모델이 이미 로드되어 있습니다.',
+            'model_loaded': True,
+            'model_version': self.model_version
+        }
+    
+    def _load_production_model(self):
+        """Production 스테이지 모델 실제 로드 (_load_lock을 잡은 상태에서 호출)"""
         
-        # Production 모델 존재 확인
-        model_check = self.check_production_model_exists()
-        if not model_check['exists']:
-            return {
-                'success': False,
-                'message': f"Production 모델 없음: {model_check['message']}",
-                'model_loaded': False,
-                'model_version': None
-            }
+        # 실패 위치 구분용 (레지스트리 조회 실패 / 아티팩트 다운로드·모델 로드 실패)
+        step = '레지스트리 조회'
         
         try:
+            # Production 버전 조회 - 레지스트리 호출 1회 (별도의 연결/존재 확인 없음)
+            production_versions = self._client.get_latest_versions(
+                name=self.model_registry_name,
+                stages=["Production"]
+            )
+            if not production_versions:
+                logger.warning("⚠️ Production 스테이지에 모델이 없습니다.")
+                return {
+                    'success': False,
+                    'message': 'Production 모델 없음: Production 스테이지에 등록된 모델이 없습니다.',
+                    'model_loaded': False,
+                    'model_version': None
+                }
+            version = production_versions[0].version
+            
             # 모델 URI 설정
             self.model_uri = f"models:/{self.model_registry_name}/Production"
             
-            logger.info(f"🤖 Production 모델 로딩 중...")
-            logger.info(f"   📍 모델 URI: {self.model_uri}")
-            logger.info(f"   🏷️ 모델 버전: {model_check['version']}")
+            logger.info("🤖 Production 모델 로딩 중...")
+            logger.info("   📍 모델 URI: %s", self.model_uri)
+            logger.info("   🏷️ 모델 버전: %s", version)
             
-            # MLflow로 모델 로드
-            self.model = mlflow.xgboost.load_model(self.model_uri)
+            # MLflow로 모델 로드 (버전별 로컬 캐시 경로에서)
+            step = '모델 로드'
+            import mlflow.xgboost
+            local_path = self._get_cached_model_path(version)
+            self.model = mlflow.xgboost.load_model(local_path)
             
-            # 상태 업데이트
+            # XGBoost 모델 정보 확인 (이후 조회에서 재사용하도록 저장)
+            self._n_features = getattr(self.model, 'n_features_in_', None)
+            self._is_xgboost = hasattr(self.model, 'get_booster')
+            self._configure_threads()
+            
+            # 상태 업데이트 (잠금 없이 읽는 스레드가 있으므로 로드 완료 플래그는 마지막에 설정)
+            self.model_version = version
             self.is_model_loaded = True
-            self.model_version = model_check['version']
+            self._save_last_production_version(version)
             
             logger.info("✅ Production 모델 로드 완료!")
-            logger.info(f"   🏷️ 모델 타입: {type(self.model)}")
-            
-            # XGBoost 모델 정보 확인
-            try:
-                if hasattr(self.model, 'n_features_in_'):
-                    logger.info(f"   📊 입력 특성 수: {self.model.n_features_in_}")
-                if hasattr(self.model, 'get_booster'):
-                    logger.info(f"   🚀 XGBoost 모델 확인됨")
-            except:
-                pass
+            logger.info("   🏷️ 모델 타입: %s", type(self.model))
+            if self._n_features is not None:
+                logger.info("   📊 입력 특성 수: %d", self._n_features)
+            if self._is_xgboost:
+                logger.info("   🚀 XGBoost 모델 확인됨")
             
             return {
                 'success': True,
@@ -229,21 +289,178 @@ class MLflowModelService:
                 'model_version': self.model_version
             }
             
-        except Exception as e:
-            logger.error(f"❌ 모델 로딩 실패: {e}")
+        except _mlflow_errors() as e:
+            logger.error("❌ 모델 로딩 실패 (%s): %s", step, e)
+            
+            # 레지스트리에 접근할 수 없으면 마지막으로 로드했던 Production 모델 캐시로 대체
+            if step == '레지스트리 조회':
+                fallback = self._load_last_cached_model()
+                if fallback is not None:
+                    return fallback
             
             # 실패 시 상태 초기화
             self.is_model_loaded = False
             self.model = None
             self.model_version = None
+            self._n_features = None
+            self._is_xgboost = False
             
             return {
                 'success': False,
-                'message': f'MLflow 모델 로드 실패: {str(e)}',
+                'message': f'MLflow {step} 실패: {str(e)}',
                 'model_loaded': False,
                 'model_version': None
             }
             
+    def predict_batch(self, rows):
+        """
+        특성 행렬 전체를 한 번의 호출로 예측
+        
+        행 단위로 predict를 반복하지 않고 (N, F) 행렬을 그대로 XGBoost에 넘겨
+        트리 순회를 C++ 커널 안에서 일괄 처리합니다.
+        
+        Args:
+            rows (np.ndarray): (영화 수, 특성 수) 형태의 특성 행렬
+        
+        Returns:
+            np.ndarray: 영화별 예측 평점 (N,)
+        """
+        if not self.is_model_loaded:
+            raise RuntimeError("모델이 로드되지 않았습니다.")
+        
+        import numpy as np
+        
+        # XGBoost가 내부 변환 없이 바로 읽을 수 있는 float32 C-연속 배열로 맞춤 (이미 맞으면 복사 없음)
+        rows = np.ascontiguousarray(rows, dtype=np.float32)
+        
+        # sklearn 래퍼(XGBRegressor)는 ndarray 입력 시 DMatrix 생성 없이 inplace_predict 사용
+        # (best_iteration 등 학습 설정도 그대로 반영됨)
+        if self._is_xgboost:
+            return self.model.predict(rows)
+        
+        # 원시 Booster로 저장된 모델
+        return self.model.inplace_predict(rows)
+        
+    def _get_cached_model_path(self, version):
+        """
+        모델 버전의 로컬 아티팩트 경로 반환 (캐시에 없으면 한 번만 다운로드)
+        
+        다운로드가 끝까지 완료되면 버전 디렉토리에 .model_path 표시 파일을 남기고,
+        이 파일이 있는 경우에만 캐시를 사용합니다 (중간에 끊긴 다운로드는 다시 받음).
+        
+        Args:
+            version (str): 모델 레지스트리 버전
+        
+        Returns:
+            str: mlflow.xgboost.load_model에 넘길 로컬 모델 경로
+        """
+        cache_dir = os.path.join(self.model_cache_dir, self.model_registry_name, str(version))
+        marker_path = os.path.join(cache_dir, ".model_path")
+        
+        if os.path.isfile(marker_path):
+            with open(marker_path, encoding="utf-8") as f:
+                local_path = f.read().strip()
+            if os.path.exists(local_path):
+                logger.info("⚡ 로컬 모델 캐시 사용: %s", local_path)
+                return local_path
+        
+        # Stage가 아닌 버전으로 고정된 URI에서 다운로드 (캐시 내용과 버전이 항상 일치)
+        from mlflow import artifacts
+        
+        os.makedirs(cache_dir, exist_ok=True)
+        local_path = artifacts.download_artifacts(
+            artifact_uri=f"models:/{self.model_registry_name}/{version}",
+            dst_path=cache_dir
+        )
+        with open(marker_path, "w", encoding="utf-8") as f:
+            f.write(local_path)
+        
+        logger.info("💾 모델 아티팩트 캐시 저장: %s", local_path)
+        return local_path
+        
+    def _configure_threads(self):
+        """
+        XGBoost 예측 스레드 수 설정
+        
+        XGB_NTHREAD 환경변수가 있으면 그 값을, 없으면 할당된 CPU 코어를
+        uvicorn 워커 수(WEB_CONCURRENCY)로 나눈 값을 사용합니다.
+        (워커 수 × XGB_NTHREAD가 물리 코어 수를 넘지 않도록 맞춰야 스레드 경합이 없음)
+        """
+        # sklearn 래퍼는 내부 Booster를, 원시 Booster로 저장된 모델은 그 자체를 설정
+        booster = self.model.get_booster() if self._is_xgboost else self.model
+        if not hasattr(booster, 'set_param'):
+            return
+        
+        n_threads = os.getenv("XGB_NTHREAD")
+        if n_threads:
+            n_threads = int(n_threads)
+        else:
+            # 컨테이너/작업 스케줄러가 CPU를 제한한 경우 실제로 할당된 코어 수 사용
+            if hasattr(os, 'sched_getaffinity'):
+                n_cores = len(os.sched_getaffinity(0))
+            else:
+                n_cores = os.cpu_count() or 1
+            n_workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+            n_threads = max(1, n_cores // max(1, n_workers))
+        
+        if self._is_xgboost:
+            self.model.set_params(n_jobs=n_threads)
+        booster.set_param({'nthread': n_threads})
+        logger.info("   🧵 예측 스레드 수: %d", n_threads)
+    
+    def _last_production_version_path(self):
+        """마지막으로 로드한 Production 모델 버전을 기록하는 파일 경로"""
+        return os.path.join(self.model_cache_dir, self.model_registry_name, ".production_version")
+    
+    def _save_last_production_version(self, version):
+        """로드에 성공한 Production 모델 버전 기록 (레지스트리 장애 시 대체 모델 선택용)"""
+        try:
+            with open(self._last_production_version_path(), "w", encoding="utf-8") as f:
+                f.write(str(version))
+        except OSError as e:
+            logger.warning("⚠️ Production 모델 버전 기록 실패: %s", e)
+    
+    def _load_last_cached_model(self):
+        """
+        마지막으로 로드했던 Production 모델을 로컬 캐시에서 로드
+        
+        MLflow 서버에 접근할 수 없을 때만 사용하며, 캐시가 없으면 None을 반환합니다.
+        
+        Returns:
+            dict: load_production_model과 같은 형태의 결과 (stale=True) 또는 None
+        """
+        try:
+            with open(self._last_production_version_path(), encoding="utf-8") as f:
+                version = f.read().strip()
+            marker_path = os.path.join(
+                self.model_cache_dir, self.model_registry_name, version, ".model_path"
+            )
+            with open(marker_path, encoding="utf-8") as f:
+                local_path = f.read().strip()
+            
+            import mlflow.xgboost
+            model = mlflow.xgboost.load_model(local_path)
+        except (OSError, *_mlflow_errors()) as e:
+            logger.warning("⚠️ 캐시된 모델로 대체 실패: %s", e)
+            return None
+        
+        self.model = model
+        self.model_uri = local_path
+        self._n_features = getattr(model, 'n_features_in_', None)
+        self._is_xgboost = hasattr(model, 'get_booster')
+        self._configure_threads()
+        self.model_version = version
+        self.is_model_loaded = True
+        
+        logger.warning("⚠️ MLflow 연결 불가 - 캐시된 Production 모델 사용 (버전: %s)", version)
+        return {
+            'success': True,
+            'message': f'MLflow에 연결할 수 없어 캐시된 모델(버전 {version})을 사용합니다.',
+            'model_loaded': True,
+            'model_version': version,
+            'stale': True
+        }
+        
     def get_model_info(self):
         """현재 로드된 모델 정보 조회"""
         if not self.is_model_loaded:
@@ -260,13 +477,10 @@ class MLflowModelService:
             'registry_name': self.model_registry_name
         }
         
-        # XGBoost 모델 추가 정보
-        try:
-            if hasattr(self.model, 'n_features_in_'):
-                info['n_features'] = self.model.n_features_in_
-            if hasattr(self.model, 'get_booster'):
-                info['is_xgboost'] = True
-        except:
-            pass
+        # XGBoost 모델 추가 정보 (로드 시 확인한 값)
+        if self._n_features is not None:
+            info['n_features'] = self._n_features
+        if self._is_xgboost:
+            info['is_xgboost'] = True
         
         return info
\ No newline at end of file
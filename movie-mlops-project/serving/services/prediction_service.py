@@ -1,16 +1,12 @@
-import pandas as pd
 import logging
 import sys
 import os
+import threading
+import numpy as np
 
-# 경로 설정 - 상위 디렉토리의 services 모듈 import 가능하도록
-current_dir = os.path.dirname(os.path.abspath(__file__))
-parent_dir = os.path.dirname(current_dir)
-sys.path.append(parent_dir)
-
-# 서비스 모듈 import
-from services.mlflow_service import MLflowModelService
-from services.data_service import DataService
+# 서비스 모듈 import (프로젝트 루트에서 serving 패키지로 실행)
+from serving.services.mlflow_service import MLflowModelService
+from serving.services.data_service import DataService
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
@@ -23,6 +19,9 @@ class SimplePredictionService:
     전체 영화 데이터에 대한 평점 예측을 수행합니다.
     """    
     
+    # predict_all 직후 미리 계산해 두는 상위 영화 수 (이 범위의 get_top_movies는 슬라이스만 수행)
+    TOP_MOVIES_CACHE_SIZE = 100
+    
     def __init__(self):
         """
         예측 서비스 초기화
@@ -35,10 +34,15 @@ class SimplePredictionService:
         self.data_service = DataService()             # 데이터 관리 담당
         
         # 예측 결과 저장소
-        self.predictions = None                       # 예측 결과가 저장될 딕셔너리
+        self.predictions = None                       # 예측 결과가 저장될 딕셔너리 (NumPy 배열)
+        self._predictions_payload = None              # get_predictions 응답 캐시 (predict_all 시 초기화)
+        self._prediction_key = None                   # (모델 버전, 모델 객체, 특성 행렬) - 예측 재사용 판단용
+        self._top_movies_cache = []                   # 예측 평점 상위 영화 목록 (predict_all 시 재계산)
         
         # 서비스 상태 관리
         self.is_ready = False                        # 예측 준비 완료 여부
+        self._init_lock = threading.RLock()          # initialize 동시 실행 방지
+        self._status_cache = None                    # get_status 결과 캐시 (상태 변경 시 초기화)
         
         logger.info("✅ SimplePredictionService 객체 생성 완료")
         
@@ -57,62 +61,71 @@ class SimplePredictionService:
                 - model_version (str): 로드된 모델 버전
                 - data_count (int): 로드된 영화 데이터 개수
         """
-        try:
-            logger.info("🚀 예측 서비스 초기화 시작...")
-            
-            # MLflow Production 모델 로드
-            logger.info("MLflow Production 모델 로딩 중...")
-            model_result = self.mlflow_service.load_production_model()
-            
-            if not model_result['success']:
-                logger.error(f"❌ 모델 로드 실패: {model_result['message']}")
-                return {
-                    'success': False, 
-                    'message': f"모델 로드 실패: {model_result['message']}"
-                }
-            
-            logger.info(f"✅ 모델 로드 성공! 버전: {model_result.get('model_version')}")
-                
-            # CSV 테스트 데이터 로드
-            logger.info("CSV 테스트 데이터 로딩 중...")
-            data_result = self.data_service.load_data()
-            
-            if not data_result['success']:
-                logger.error(f"❌ 데이터 로드 실패: {data_result['message']}")
-                return {
-                    'success': False, 
-                    'message': f"데이터 로드 실패: {data_result['message']}"
-                }
-            
-            logger.info(f"✅ 데이터 로드 성공! 영화 수: {data_result['shape'][0]:,}개")
-            
-            # 예측 준비 완료 상태로 변경
-            self.is_ready = True
-            logger.info("✅ 예측 서비스 초기화 완료!")
-            
+        # 여러 요청이 동시에 초기화를 시작해도 모델/데이터 로드는 한 스레드씩 수행
+        with self._init_lock:
+            try:
+                return self._initialize()
+            finally:
+                # 성공/실패와 관계없이 모델/데이터 상태가 바뀌었을 수 있으므로 상태 캐시 초기화
+                self._status_cache = None
+    
+    def _initialize(self):
+        """
+        initialize() 실제 처리 (_init_lock을 잡은 상태에서 호출)
+        
+        모델/데이터 서비스가 예상 가능한 오류를 결과 dict로 반환하므로
+        여기서는 예외를 잡지 않습니다 (그 밖의 예외는 프로그래밍 오류로 그대로 전파).
+        """
+        logger.info("🚀 예측 서비스 초기화 시작...")
+        
+        # MLflow Production 모델 로드
+        logger.info("MLflow Production 모델 로딩 중...")
+        model_result = self.mlflow_service.load_production_model()
+        
+        if not model_result['success']:
+            logger.error("❌ 모델 로드 실패: %s", model_result['message'])
             return {
-                'success': True,
-                'message': '예측 서비스가 성공적으로 초기화되었습니다.',
-                'model_version': model_result.get('model_version'),
-                'data_count': data_result['shape'][0]
+                'success': False, 
+                'message': f"모델 로드 실패: {model_result['message']}"
             }
+        
+        logger.info("✅ 모델 로드 성공! 버전: %s", model_result.get('model_version'))
             
-        except Exception as e:
-            logger.error(f"❌ 초기화 중 예외 발생: {e}")
-            self.is_ready = False
-            
+        # CSV 테스트 데이터 로드
+        logger.info("CSV 테스트 데이터 로딩 중...")
+        data_result = self.data_service.load_data()
+        
+        if not data_result['success']:
+            logger.error("❌ 데이터 로드 실패: %s", data_result['message'])
             return {
                 'success': False, 
-                'message': f"초기화 실패: {str(e)}"
+                'message': f"데이터 로드 실패: {data_result['message']}"
             }
         
+        logger.info("✅ 데이터 로드 성공! 영화 수: %d개", data_result['shape'][0])
+        
+        # 예측 준비 완료 상태로 변경
+        self.is_ready = True
+        logger.info("✅ 예측 서비스 초기화 완료!")
+        
+        return {
+            'success': True,
+            'message': '예측 서비스가 성공적으로 초기화되었습니다.',
+            'model_version': model_result.get('model_version'),
+            'data_count': data_result['shape'][0]
+        }
+        
         
-    def predict_all(self):
+    def predict_all(self, force=False):
         """
         전체 영화에 대한 평점 예측 수행
         
         로드된 데이터에서 특성을 추출하고 모델을 사용하여
         모든 영화의 평점을 예측합니다.
+        모델과 특성 행렬이 이전 예측 때와 같으면 저장된 결과를 그대로 사용합니다.
+        
+        Args:
+            force (bool): True이면 캐시를 무시하고 다시 예측 (기본값: False)
         
         Returns:
             dict: 예측 결과 정보
@@ -123,38 +136,70 @@ class SimplePredictionService:
         if not self.is_ready:
             return {'success': False, 'message': '서비스가 초기화되지 않았습니다.'}
         
+        # 예측 전에 입력 상태를 먼저 확인 (정상 경로에서는 예외 처리에 의존하지 않음)
+        if not self.mlflow_service.is_model_loaded or not self.data_service.is_data_loaded:
+            return {'success': False, 'message': '모델 또는 데이터가 로드되지 않았습니다.'}
+        
         try:
             logger.info("🤖 전체 데이터 예측 시작...")
             
             # 예측용 데이터 준비
-            data = self.data_service.data
+            model = self.mlflow_service.model
+            
+            # 특성 데이터 추출 (타겟 변수 제외, float32 배열)
+            # - 학습 시 특성 순서가 기록되어 있으면 같은 순서로 맞춤
+            feature_names = None
+            if hasattr(model, 'get_booster'):
+                feature_names = model.get_booster().feature_names
+            X = self.data_service.get_feature_matrix(feature_names)
             
-            # 특성 데이터 추출 (타겟 변수와 ID 제외)
-            X = data.drop(['vote_average'], axis=1)
+            # 모델 버전/모델 객체/특성 행렬이 모두 그대로면 이전 예측 결과 재사용
+            # - 모델을 다시 로드하거나 데이터를 다시 읽으면 객체가 바뀌므로 자동으로 다시 예측
+            prediction_key = (self.mlflow_service.model_version, model, X)
+            previous_key = self._prediction_key
+            if (not force and self.predictions is not None and previous_key is not None
+                    and previous_key[0] == prediction_key[0]
+                    and previous_key[1] is model and previous_key[2] is X):
+                sample_count = self.predictions['sample_count']
+                logger.info("♻️ 이전 예측 결과 재사용: %d개 영화", sample_count)
+                return {
+                    'success': True,
+                    'message': f'{sample_count}개 영화에 대한 예측 결과가 이미 최신입니다.',
+                    'sample_count': sample_count,
+                    'cached': True
+                }
             
-            # 영화 ID는 결과 매핑용으로 별도 저장
-            movie_ids = data['id'].tolist()
+            # 영화 ID는 결과 매핑용으로 별도 저장 (로드 시 만들어 둔 배열 사용)
+            movie_ids = self.data_service.movie_ids
             
-            # 모델을 사용한 예측 수행
-            predictions = self.mlflow_service.model.predict(X)
+            # 모델을 사용한 예측 수행 (전체 행렬 1회 배치 예측)
+            predictions = self.mlflow_service.predict_batch(X)
             
-            # 예측 결과 저장
+            # 예측 결과 저장 (float32/int64 배열 그대로 - 리스트 변환은 응답 생성 시에만)
             self.predictions = {
-                'predictions': predictions.tolist(),  # numpy array를 list로 변환
+                'predictions': predictions,
                 'movie_ids': movie_ids,
                 'sample_count': len(predictions)
             }
+            self._predictions_payload = None  # 새 예측 결과로 응답을 다시 만들도록 캐시 초기화
+            self._status_cache = None
+            self._prediction_key = prediction_key
+            self._top_movies_cache = self._rank_top_movies(self.TOP_MOVIES_CACHE_SIZE)
             
-            logger.info(f"✅ 예측 완료! {len(predictions)}개 영화")
+            logger.info("✅ 예측 완료! %d개 영화", len(predictions))
             
             return {
                 'success': True,
                 'message': f'{len(predictions)}개 영화에 대한 예측이 완료되었습니다.',
-                'sample_count': len(predictions)
+                'sample_count': len(predictions),
+                'cached': False
             }
             
-        except Exception as e:
-            logger.error(f"❌ 예측 실패: {e}")
+        except (KeyError, ValueError, RuntimeError) as e:
+            # KeyError: 모델 특성 이름이 데이터에 없음
+            # ValueError: 특성 수 불일치 등 입력 오류 (XGBoostError 포함)
+            # RuntimeError: 모델 미로드
+            logger.error("❌ 예측 실패: %s", e)
             return {'success': False, 'message': f"예측 실패: {str(e)}"}
         
         
@@ -163,6 +208,7 @@ class SimplePredictionService:
         전체 예측 결과 조회
         
         수행된 예측 결과를 API 응답 형태로 반환합니다.
+        응답은 predict_all()이 다시 실행될 때까지 캐시되므로 호출 측에서 수정하면 안 됩니다.
         
         Returns:
             dict: 예측 결과 데이터
@@ -173,7 +219,11 @@ class SimplePredictionService:
         if not self.predictions:
             return {'available': False, 'message': '예측 결과가 없습니다.'}
         
-        return {
+        # 예측 결과가 바뀌지 않았으면 이전에 만든 응답을 그대로 반환 (영화별 dict 재생성 생략)
+        if self._predictions_payload is not None:
+            return self._predictions_payload
+        
+        self._predictions_payload = {
             'available': True,
             'sample_count': self.predictions['sample_count'],
             'results': [
@@ -182,11 +232,12 @@ class SimplePredictionService:
                     'predicted_rating': pred
                 }
                 for movie_id, pred in zip(
-                    self.predictions['movie_ids'], 
-                    self.predictions['predictions']
+                    self.predictions['movie_ids'].tolist(), 
+                    self.predictions['predictions'].tolist()
                 )
             ]
         }
+        return self._predictions_payload
         
         
     def get_top_movies(self, top_n=10):
@@ -207,31 +258,50 @@ class SimplePredictionService:
         if not self.predictions:
             return {'available': False, 'message': '예측 결과가 없습니다.'}
         
-        # 예측 평점 기준으로 정렬
-        predictions = self.predictions['predictions']
-        movie_ids = self.predictions['movie_ids']
-        
-        # 평점 높은 순으로 정렬하여 상위 N개 추출
-        sorted_data = sorted(
-            zip(movie_ids, predictions), 
-            key=lambda x: x[1],  # 예측 평점 기준
-            reverse=True         # 내림차순
-        )[:top_n]
-        
-        # 결과 포맷팅
-        top_movies = []
-        for rank, (movie_id, predicted_rating) in enumerate(sorted_data, 1):
-            top_movies.append({
-                'rank': rank,
-                'movie_id': movie_id,
-                'predicted_rating': round(predicted_rating, 2)
-            })
+        # 미리 계산한 범위 안이면 슬라이스만, 그보다 많이 요청하면 새로 계산
+        if top_n <= self.TOP_MOVIES_CACHE_SIZE:
+            top_movies = self._top_movies_cache[:max(0, top_n)]
+        else:
+            top_movies = self._rank_top_movies(top_n)
         
         return {
             'available': True,
             'top_movies': top_movies,
-            'total_count': len(predictions)
+            'total_count': self.predictions['sample_count']
         }
+    
+    def _rank_top_movies(self, top_n):
+        """
+        예측 평점 상위 N개 영화 목록 생성
+        
+        Args:
+            top_n (int): 추출할 영화 개수
+        
+        Returns:
+            list: [{'rank', 'movie_id', 'predicted_rating'}, ...] 평점 높은 순
+        """
+        ratings = self.predictions['predictions']
+        movie_ids = self.predictions['movie_ids']
+        
+        # 평점 높은 순으로 상위 N개 추출
+        # - 전체 정렬(O(N log N)) 대신 argpartition으로 상위 N개만 고른 뒤(O(N)) 그 N개만 정렬
+        k = max(0, min(top_n, len(ratings)))
+        if 0 < k < len(ratings):
+            top_idx = np.argpartition(-ratings, k - 1)[:k]
+        else:
+            top_idx = np.arange(k)
+        top_idx = top_idx[np.argsort(-ratings[top_idx], kind='stable')]
+        
+        return [
+            {
+                'rank': rank,
+                'movie_id': movie_id,
+                'predicted_rating': round(predicted_rating, 2)
+            }
+            for rank, (movie_id, predicted_rating) in enumerate(
+                zip(movie_ids[top_idx].tolist(), ratings[top_idx].tolist()), 1
+            )
+        ]
         
         
     def get_status(self):
@@ -239,6 +309,7 @@ class SimplePredictionService:
         예측 서비스 상태 조회
         
         현재 서비스의 전반적인 상태를 확인합니다.
+        상태는 initialize()/predict_all() 실행 시에만 바뀌므로 그 사이에는 캐시된 값을 복사해 반환합니다.
         
         Returns:
             dict: 서비스 상태 정보
@@ -248,13 +319,15 @@ class SimplePredictionService:
                 - predictions_available (bool): 예측 결과 존재 여부
                 - sample_count (int): 예측된 영화 수
         """
-        return {
-            'service_ready': self.is_ready,
-            'model_loaded': self.mlflow_service.is_model_loaded,
-            'data_loaded': self.data_service.is_data_loaded,
-            'predictions_available': self.predictions is not None,
-            'sample_count': self.predictions['sample_count'] if self.predictions else 0
-        }
+        if self._status_cache is None:
+            self._status_cache = {
+                'service_ready': self.is_ready,
+                'model_loaded': self.mlflow_service.is_model_loaded,
+                'data_loaded': self.data_service.is_data_loaded,
+                'predictions_available': self.predictions is not None,
+                'sample_count': self.predictions['sample_count'] if self.predictions else 0
+            }
+        return dict(self._status_cache)
 
 # =============================================================================
 # 테스트 함수
@@ -318,8 +391,6 @@ def debug_environment():
 
 # 실행 부분
 if __name__ == "__main__":
-    import sys
-    
     # 로깅 설정
     logging.basicConfig(
         level=logging.INFO,
@@ -333,8 +404,8 @@ if __name__ == "__main__":
             test_prediction_service()
         else:
             print("사용법:")
-            print("  python prediction_service.py       # 기본 테스트")
-            print("  python prediction_service.py test  # 기본 테스트")
-            print("  python prediction_service.py debug # 환경 디버깅")
+            print("  python -m serving.services.prediction_service       # 기본 테스트")
+            print("  python -m serving.services.prediction_service test  # 기본 테스트")
+            print("  python -m serving.services.prediction_service debug # 환경 디버깅")
     else:
         test_prediction_service()
\ No newline at end of file
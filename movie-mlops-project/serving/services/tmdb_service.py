@@ -0,0 +1,128 @@
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+
+class TMDBService:
+    """
+    TMDB 영화 상세 정보 조회 서비스
+    
+    여러 영화의 상세 정보를 서버 쪽에서 한 번에 모아 조회합니다.
+    영화별 결과는 메모리에 캐시하여 요청 간에 공유합니다 (상위 N개 개수가 달라도 겹치는 영화는 재조회 없음).
+    """
+    
+    # 한 번에 동시에 보내는 TMDB 요청 수
+    MAX_WORKERS = 8
+    # 메모리에 보관하는 영화 상세 정보 최대 개수 (초과 시 오래된 항목부터 제거)
+    CACHE_SIZE = 2048
+    
+    def __init__(self):
+        """TMDB 서비스 초기화 (HTTP 세션은 최초 조회 시 생성)"""
+        self.api_key = os.getenv("TMDB_API_KEY")
+        self.base_url = os.getenv("TMDB_BASE_URL", "https://api.themoviedb.org/3")
+        
+        self._session = None
+        self._cache = {}                    # movie_id -> 상세 정보 dict (조회 실패는 저장하지 않음)
+        self._lock = threading.Lock()
+        
+        if not self.api_key:
+            logger.warning("⚠️ TMDB_API_KEY가 설정되지 않아 영화 상세 정보를 조회할 수 없습니다")
+    
+    @property
+    def is_available(self):
+        """TMDB API 키 설정 여부"""
+        return bool(self.api_key)
+    
+    def _get_session(self):
+        """커넥션 풀을 공유하는 requests 세션 (최초 1회 생성)"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    # requests는 이 기능을 쓸 때만 로드
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    from urllib3.util.retry import Retry
+                    
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=1,
+                        pool_maxsize=self.MAX_WORKERS,
+                        max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+    
+    def get_movie_details(self, movie_id):
+        """
+        영화 1개의 상세 정보 조회 (캐시에 있으면 네트워크 호출 없음)
+        
+        Args:
+            movie_id (int): TMDB 영화 ID
+        
+        Returns:
+            dict: 제목/포스터/개봉 연도/장르 등 카드 표시용 정보, 조회 실패 시 None
+        """
+        details = self._cache.get(movie_id)
+        if details is not None or not self.api_key:
+            return details
+        
+        import orjson
+        import requests
+        
+        if self.base_url.endswith('/movie'):
+            url = f"{self.base_url}/{movie_id}"
+        else:
+            url = f"{self.base_url}/movie/{movie_id}"
+        params = {"api_key": self.api_key, "language": "ko-KR"}
+        
+        try:
+            response = self._get_session().get(url, params=params, timeout=5)
+            if response.status_code != 200:
+                logger.warning("⚠️ TMDB 조회 실패 (영화 ID %s): HTTP %d", movie_id, response.status_code)
+                return None
+            data = orjson.loads(response.content)
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+            logger.warning("⚠️ TMDB 조회 실패 (영화 ID %s): %s", movie_id, e)
+            return None
+        
+        # 영화 카드에 표시하는 값만 미리 가공해서 보관 (개봉 연도, 최대 3개 장르)
+        details = {
+            'title': data.get('title', f'영화 ID {movie_id}'),
+            'original_title': data.get('original_title', ''),
+            'poster_path': data.get('poster_path'),
+            'year': (data.get('release_date') or '')[:4],
+            'genres_short': ', '.join(genre['name'] for genre in (data.get('genres') or [])[:3])
+        }
+        
+        with self._lock:
+            if len(self._cache) >= self.CACHE_SIZE:
+                # dict는 삽입 순서를 유지하므로 가장 먼저 들어온 항목 제거
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[movie_id] = details
+        return details
+    
+    def get_movie_details_many(self, movie_ids):
+        """
+        여러 영화의 상세 정보를 동시에 조회
+        
+        Args:
+            movie_ids (list): TMDB 영화 ID 리스트
+        
+        Returns:
+            list: 입력 순서대로의 상세 정보 (조회 실패한 영화는 None)
+        """
+        # 중복 ID는 한 번만 조회하고, 캐시에 없는 영화만 병렬 조회
+        details = {movie_id: self._cache.get(movie_id) for movie_id in dict.fromkeys(movie_ids)}
+        missing = [movie_id for movie_id, value in details.items() if value is None]
+        if missing and self.api_key:
+            with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(missing))) as executor:
+                details.update(zip(missing, executor.map(self.get_movie_details, missing)))
+        
+        return [details[movie_id] for movie_id in movie_ids]
+
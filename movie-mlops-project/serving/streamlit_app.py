@@ -1,17 +1,32 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
+import orjson
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import time
+import html
+import io
+import tempfile
+from requests_cache import CachedSession
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from streamlit_autorefresh import st_autorefresh
 
 # 환경변수 로드
 import os
-from dotenv import load_dotenv
+from dotenv import find_dotenv, load_dotenv
 
 # .env 파일 로드
-load_dotenv()
+# - Streamlit은 상호작용마다 스크립트 전체를 다시 실행하므로 프로세스당 한 번만 읽음
+# - SKIP_DOTENV=1이면 생략 (컨테이너처럼 환경변수가 이미 주입된 경우)
+if os.getenv("SKIP_DOTENV") != "1" and not os.environ.get("_DOTENV_LOADED"):
+    _env_path = find_dotenv()
+    load_dotenv(_env_path)
+    os.environ["_DOTENV_LOADED"] = _env_path or "none"
 
 # 페이지 설정
 st.set_page_config(
@@ -40,15 +55,68 @@ st.markdown("""
 API_BASE_URL = "http://localhost:8000"
 TMDB_API_KEY = os.getenv("TMDB_API_KEY")
 TMDB_BASE_URL = os.getenv("TMDB_BASE_URL", "https://api.themoviedb.org/3")
-TMDB_IMAGE_URL = "https://image.tmdb.org/t/p/w200"
+TMDB_IMAGE_BASE_URL = "https://image.tmdb.org/t/p"
+TMDB_IMAGE_URL = f"{TMDB_IMAGE_BASE_URL}/w154"  # 카드 포스터 표시 폭(130px)에 맞는 가장 작은 크기
+# TMDB 응답 디스크 캐시 (프로세스 재시작/수동 새로고침 후에도 유지, 7일 보관)
+TMDB_CACHE_PATH = os.getenv("TMDB_CACHE_PATH", os.path.join(tempfile.gettempdir(), "tmdb_cache.sqlite"))
+TMDB_CACHE_EXPIRE = 7 * 24 * 3600
+# STREAMLIT_CACHE_PERSIST=1이면 TMDB 영화 정보 캐시를 디스크에 저장 (재시작 후에도 유지)
+# - Streamlit은 디스크 캐시에 ttl을 적용하지 않으므로 이때는 ttl 없이 보관
+CACHE_PERSIST = "disk" if os.getenv("STREAMLIT_CACHE_PERSIST", "").lower() in ("1", "true", "disk") else None
 
-@st.cache_data(ttl=300)  # 5분 캐시
+# TOP 영화 탭에서 고를 수 있는 표시 개수
+TOP_COUNT_OPTIONS = [5, 10, 20, 30]
+
+# 메인 탭 이름 (선택된 탭만 렌더링)
+TAB_LABELS = ["📊 대시보드", "🏆 TOP 영화", "📈 통계 분석", "📋 전체 데이터"]
+
+def _mount_pooled_adapter(session):
+    """커넥션 풀 + 재시도 어댑터를 세션에 연결"""
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+@st.cache_resource
+def get_http_session():
+    """
+    FastAPI 호출에 공유하는 HTTP 세션 (커넥션 재사용)
+    
+    Streamlit 재실행마다 새로 만들지 않도록 프로세스당 1개만 생성합니다.
+    """
+    return _mount_pooled_adapter(requests.Session())
+
+@st.cache_resource
+def get_tmdb_session():
+    """TMDB 호출용 HTTP 세션 (SQLite 디스크 캐시 - 이미 받은 영화 정보는 네트워크 호출 없음)"""
+    session = CachedSession(
+        TMDB_CACHE_PATH,
+        backend="sqlite",
+        expire_after=TMDB_CACHE_EXPIRE,
+        allowable_methods=("GET",)
+    )
+    return _mount_pooled_adapter(session)
+
+@st.cache_data(ttl=300, max_entries=64)  # 5분 캐시 (엔드포인트/파라미터 조합 최대 64개)
 def get_api_data(endpoint, params=None):
     """API에서 데이터 가져오기"""
+    return _request_api(endpoint, params)
+
+@st.cache_data(ttl=30, show_spinner=False)  # 30초 캐시 (상태 표시는 자주 갱신)
+def get_health():
+    """FastAPI 헬스체크 결과 가져오기"""
+    return _request_api("health")
+
+def _request_api(endpoint, params=None):
+    """FastAPI 엔드포인트 호출 (캐시 없음 - get_api_data/get_health에서 사용)"""
     try:
-        response = requests.get(f"{API_BASE_URL}/{endpoint}", params=params, timeout=10)
+        response = get_http_session().get(f"{API_BASE_URL}/{endpoint}", params=params, timeout=10)
         if response.status_code == 200:
-            return response.json(), True
+            return orjson.loads(response.content), True
         else:
             return {"error": f"HTTP {response.status_code}"}, False
     except requests.exceptions.ConnectionError:
@@ -58,46 +126,265 @@ def get_api_data(endpoint, params=None):
     except Exception as e:
         return {"error": str(e)}, False
 
-@st.cache_data(ttl=3600)  # 1시간 캐시
+# 1시간 캐시, 최대 5000편 (작업 스레드에서 호출되므로 스피너 없음)
+# - 조회 실패는 예외로 알려 캐시(디스크 포함)에 남기지 않음 (다음 호출에서 다시 조회)
+@st.cache_data(
+    ttl=None if CACHE_PERSIST else 3600,
+    persist=CACHE_PERSIST,
+    max_entries=5000,
+    show_spinner=False
+)
+def _fetch_movie_details(movie_id):
+    """TMDB API에서 영화 상세 정보 가져오기 (성공한 결과만 캐시, 실패 시 예외 발생)"""
+    base_url = TMDB_BASE_URL
+    if base_url.endswith('/movie'):
+        url = f"{base_url}/{movie_id}"
+    else:
+        url = f"{base_url}/movie/{movie_id}"
+        
+    params = {"api_key": TMDB_API_KEY, "language": "ko-KR"}
+    
+    response = get_tmdb_session().get(url, params=params, timeout=5)
+    
+    if response.status_code != 200:
+        raise LookupError(f"TMDB 조회 실패 (영화 ID {movie_id}): HTTP {response.status_code}")
+    
+    data = orjson.loads(response.content)
+    # 카드에 표시하는 값만 미리 가공해서 캐시 (개봉 연도, 최대 3개 장르)
+    return {
+        'title': data.get('title', f'영화 ID {movie_id}'),
+        'original_title': data.get('original_title', ''),
+        'poster_path': data.get('poster_path'),
+        'year': (data.get('release_date') or '')[:4],
+        'genres_short': ', '.join(genre['name'] for genre in (data.get('genres') or [])[:3])
+    }
+
 def get_movie_details(movie_id):
-    """TMDB API에서 영화 상세 정보 가져오기"""
+    """TMDB 영화 상세 정보 (API 키가 없거나 조회 실패 시 None)"""
     if not TMDB_API_KEY:
         return None
-        
+    
     try:
-        base_url = TMDB_BASE_URL
-        if base_url.endswith('/movie'):
-            url = f"{base_url}/{movie_id}"
-        else:
-            url = f"{base_url}/movie/{movie_id}"
-            
-        params = {"api_key": TMDB_API_KEY, "language": "ko-KR"}
-        
-        response = requests.get(url, params=params, timeout=5)
-        
-        if response.status_code == 200:
-            data = response.json()
-            return {
-                'title': data.get('title', f'영화 ID {movie_id}'),
-                'original_title': data.get('original_title', ''),
-                'poster_path': data.get('poster_path'),
-                'release_date': data.get('release_date', ''),
-                'overview': data.get('overview', ''),
-                'genres': [genre['name'] for genre in data.get('genres', [])],
-                'runtime': data.get('runtime'),
-                'vote_average': data.get('vote_average')
-            }
-        else:
-            return None
-    except Exception as e:
+        return _fetch_movie_details(movie_id)
+    except (requests.exceptions.RequestException, orjson.JSONDecodeError, LookupError):
         return None
 
-def get_poster_url(poster_path):
-    """포스터 이미지 URL 생성"""
+# get_api_data와 같은 5분 캐시
+# - 조회 실패는 예외로 알려 캐시에 남기지 않음 (실패 응답은 get_api_data의 5분 캐시만 적용)
+@st.cache_resource(ttl=300, show_spinner=False)
+def _load_predictions_df():
+    """
+    전체 예측 결과 DataFrame (API 응답 → DataFrame 변환을 캐시, 실패 시 예외 발생)
+    
+    cache_resource라 매 실행마다 복사본을 만들지 않고 모든 세션이 같은 DataFrame을 공유하므로,
+    호출 측에서는 읽기만 하고 수정하지 않습니다.
+    캐시를 채울 때 예측평점 오름차순으로 한 번 정렬해 두어 필터링 시 다시 정렬하지 않습니다.
+    
+    Returns:
+        pd.DataFrame: 예측평점 오름차순 movie_id/predicted_rating 컬럼 DataFrame
+    """
+    predictions_data, pred_success = get_api_data("predictions")
+    if not pred_success:
+        raise LookupError(f"예측 결과 조회 실패: {predictions_data.get('error', '알 수 없는 오류')}")
+    
+    # dict 리스트를 컬럼 배열로 한 번씩만 읽고, 정렬된 배열로 바로 DataFrame 구성
+    # (레코드 단위 DataFrame 생성 후 sort_values로 한 번 더 복사하지 않음)
+    records = predictions_data['data']['predictions']
+    movie_ids = np.fromiter((record['movie_id'] for record in records), dtype=np.int64, count=len(records))
+    ratings = np.fromiter((record['predicted_rating'] for record in records), dtype=np.float64, count=len(records))
+    order = np.argsort(ratings, kind='stable')
+    return pd.DataFrame({'movie_id': movie_ids[order], 'predicted_rating': ratings[order]}, copy=False)
+
+def get_predictions_df():
+    """
+    전체 예측 결과 DataFrame (성공한 결과만 캐시)
+    
+    Returns:
+        tuple: (예측평점 오름차순 movie_id/predicted_rating 컬럼 DataFrame 또는 None, 성공 여부)
+    """
+    try:
+        return _load_predictions_df(), True
+    except LookupError:
+        return None, False
+
+# 예측평점 구간 경계와 이름 (FastAPI /stats의 distribution과 같은 구간, 높은 구간부터)
+RATING_BIN_EDGES = np.array([5.0, 6.0, 7.0, 8.0])
+RATING_BIN_LABELS = ["8.0_이상", "7.0_8.0", "6.0_7.0", "5.0_6.0", "5.0_미만"]
+
+def compute_dashboard_stats(df_all):
+    """
+    대시보드 통계/분포를 캐시된 예측 DataFrame에서 바로 계산 (/stats API 호출 생략)
+    
+    Args:
+        df_all (pd.DataFrame): 예측평점 오름차순으로 정렬된 전체 예측 결과
+    
+    Returns:
+        tuple: (통계 dict, (구간, 영화수) 튜플의 튜플)
+    """
+    ratings = df_all['predicted_rating'].to_numpy()
+    stats = {
+        'total_movies': len(ratings),
+        'average_rating': float(ratings.mean()),
+        'max_rating': float(ratings[-1]),
+        'min_rating': float(ratings[0])
+    }
+    
+    # 정렬된 배열이므로 구간 경계 위치만 이진 탐색해서 구간별 개수 계산
+    bounds = np.concatenate(([0], np.searchsorted(ratings, RATING_BIN_EDGES, side='left'), [len(ratings)]))
+    counts = np.diff(bounds)[::-1]
+    distribution = tuple(zip(RATING_BIN_LABELS, counts.tolist()))
+    return stats, distribution
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def make_predictions_csv(movie_ids, ratings):
+    """
+    예측 결과 CSV 바이트 생성 (같은 필터/정렬 결과면 캐시된 값 재사용)
+    
+    배열 해시는 CSV 문자열 생성보다 훨씬 가벼우므로 슬라이더 조작 시에도 부담이 적습니다.
+    CSV 문자열을 만든 뒤 인코딩하지 않고 바이트 버퍼에 10,000행씩 바로 씁니다.
+    """
+    buffer = io.BytesIO()
+    pd.DataFrame(
+        {'movie_id': movie_ids, 'predicted_rating': ratings}, copy=False
+    ).to_csv(buffer, index=False, encoding="utf-8", chunksize=10000)
+    return buffer.getvalue()
+
+def _predictions_df_key(df):
+    """차트 캐시 키용 예측 DataFrame 요약 (전체 내용 대신 행 수와 평점 합계로 해시)"""
+    return len(df), float(df['predicted_rating'].sum())
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def build_distribution_chart(distribution_items):
+    """예측평점 구간별 분포 막대 차트 (같은 분포면 만들어 둔 Figure 재사용)"""
+    labels, counts = zip(*distribution_items)
+    fig_bar = px.bar(
+        {'구간': labels, '영화수': counts}, 
+        x='구간', 
+        y='영화수',
+        title="예측평점 구간별 영화 분포",
+        color='영화수',
+        color_continuous_scale='viridis'
+    )
+    fig_bar.update_layout(height=400)
+    return fig_bar
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def build_top_movies_chart(movies, top_count):
+    """예측평점 상위 영화 막대 차트 (개수별로 만들어 둔 Figure 재사용)"""
+    # 차트에 쓰는 두 컬럼만 배열로 전달 (영화 dict 리스트 → DataFrame 변환 생략)
+    chart_data = {
+        'rank': np.fromiter((movie['rank'] for movie in movies), dtype=np.int32, count=len(movies)),
+        'predicted_rating': np.fromiter((movie['predicted_rating'] for movie in movies), dtype=np.float32, count=len(movies))
+    }
+    fig_top = px.bar(
+        chart_data, 
+        x='rank', 
+        y='predicted_rating',
+        title=f"🎬 예측평점 상위 {top_count}개 영화",
+        labels={'predicted_rating': '예측평점', 'rank': '순위'},
+        color='predicted_rating',
+        color_continuous_scale='plasma',
+        text='predicted_rating'
+    )
+    fig_top.update_traces(texttemplate='%{text:.2f}', textposition='outside')
+    fig_top.update_layout(height=500)
+    return fig_top
+
+@st.cache_data(show_spinner=False, max_entries=4, hash_funcs={pd.DataFrame: _predictions_df_key})
+def build_rating_histogram(df_all):
+    """예측평점 분포 히스토그램 (같은 예측 결과면 만들어 둔 Figure 재사용)"""
+    # 원본 값 배열만 전달하는 go.Histogram 사용 (px.histogram의 DataFrame 변환 생략)
+    fig_hist = go.Figure(go.Histogram(
+        x=df_all['predicted_rating'],
+        nbinsx=20,
+        marker_color='#FF6B6B'
+    ))
+    fig_hist.update_layout(
+        title="예측평점 분포",
+        xaxis_title='예측평점',
+        yaxis_title='영화 수',
+        height=400
+    )
+    return fig_hist
+
+@st.cache_data(show_spinner=False, max_entries=4, hash_funcs={pd.DataFrame: _predictions_df_key})
+def build_rating_boxplot(df_all):
+    """예측평점 박스플롯 (같은 예측 결과면 만들어 둔 Figure 재사용)"""
+    ratings = df_all['predicted_rating']
+    
+    # 사분위수를 미리 계산해서 5개 값만 전달 (전체 데이터 점을 브라우저로 보내지 않음)
+    q1, median, q3 = ratings.quantile([0.25, 0.5, 0.75]).tolist()
+    iqr = q3 - q1
+    lower_fence = float(ratings[ratings >= q1 - 1.5 * iqr].min())
+    upper_fence = float(ratings[ratings <= q3 + 1.5 * iqr].max())
+    fig_box = go.Figure(go.Box(
+        name='예측평점',
+        q1=[q1], median=[median], q3=[q3],
+        lowerfence=[lower_fence], upperfence=[upper_fence]
+    ))
+    # 이상치(울타리 밖 값)만 점으로 추가
+    outliers = ratings[(ratings < lower_fence) | (ratings > upper_fence)]
+    if len(outliers):
+        fig_box.add_trace(go.Scatter(
+            x=['예측평점'] * len(outliers),
+            y=outliers,
+            mode='markers',
+            showlegend=False
+        ))
+    fig_box.update_layout(
+        title="예측평점 분포 (박스플롯)",
+        yaxis_title='예측평점',
+        height=400
+    )
+    return fig_box
+
+def get_movie_details_many(movie_ids, max_workers=8):
+    """여러 영화의 TMDB 상세 정보를 동시에 가져오기 (입력 순서대로 반환)"""
+    if not movie_ids:
+        return []
+    # 작업 스레드에도 현재 스크립트 실행 컨텍스트를 연결 (캐시 함수 호출 시 컨텍스트 누락 경고 방지)
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(movie_ids)),
+        initializer=add_script_run_ctx,
+        initargs=(None, ctx)
+    ) as executor:
+        return list(executor.map(get_movie_details, movie_ids))
+
+def display_dataframe_quickly(df, max_rows=5000, **kwargs):
+    """
+    큰 DataFrame은 max_rows 행씩 잘라서 표시 (브라우저로 보내는 데이터 크기 제한)
+    
+    행 수가 max_rows를 넘으면 시작 행을 고르는 슬라이더를 함께 표시합니다.
+    """
+    n_rows = len(df)
+    if n_rows <= max_rows:
+        st.dataframe(df, **kwargs)
+        return
+    
+    start = st.slider("표시 시작 행", 0, n_rows - max_rows, 0, step=max_rows // 10)
+    st.caption(f"전체 {n_rows:,}행 중 {start + 1:,}~{start + max_rows:,}행 표시")
+    st.dataframe(df.iloc[start:start + max_rows], **kwargs)
+
+def get_poster_url(poster_path, size=None):
+    """포스터 이미지 URL 생성 (size: TMDB 이미지 크기, 예: 'w500' - 없으면 카드용 기본 크기)"""
     if poster_path:
+        if size:
+            return f"{TMDB_IMAGE_BASE_URL}/{size}{poster_path}"
         return f"{TMDB_IMAGE_URL}{poster_path}"
     return None
 
+# 영화 카드 HTML/마크다운 템플릿 (모듈 로드 시 1회 정의, 카드마다 format_map으로 채움)
+_POSTER_HTML_TEMPLATE = (
+    '<a href="{large_url}" target="_blank">'
+    '<img src="{url}" width="130" alt="{alt} 포스터" '
+    'loading="lazy" decoding="async" fetchpriority="low"></a>'
+)
+_CARD_INFO_TEMPLATE = (
+    "### {title}\n\n{original_line}"
+    "**영화 ID:** {movie_id}  \n**🎯 예측평점:** {rating:.2f}{year_line}{genres_line}"
+)
+
 def display_simple_movie_card(movie, movie_details=None):
     """간단하고 깔끔한 영화 카드 표시"""
     # 기본 정보 추출
@@ -109,15 +396,17 @@ def display_simple_movie_card(movie, movie_details=None):
     if movie_details:
         title = movie_details.get('title', f'영화 ID {movie_id}')
         original_title = movie_details.get('original_title', '')
-        release_date = movie_details.get('release_date', '')
-        genres = movie_details.get('genres', [])
+        release_year = movie_details.get('year', '')
+        genres_str = movie_details.get('genres_short', '')
         poster_url = get_poster_url(movie_details.get('poster_path'))
+        poster_large_url = get_poster_url(movie_details.get('poster_path'), size='w500')
     else:
         title = f'영화 ID {movie_id}'
         original_title = ''
-        release_date = ''
-        genres = []
+        release_year = ''
+        genres_str = ''
         poster_url = None
+        poster_large_url = None
 
     # 스트림릿 expander 사용 (깔끔한 카드 효과)
     with st.expander(f"🏅 {rank}위 | ⭐ {predicted_rating:.2f}", expanded=True):
@@ -125,69 +414,210 @@ def display_simple_movie_card(movie, movie_details=None):
         col1, col2 = st.columns([3, 1])
         
         with col1:
-            # 영화 제목
+            # 제목/원제목(다른 경우에만)/기본 정보/추가 정보를 한 번의 markdown으로 표시
+            # - 없는 항목은 빈 줄 없이 생략
             display_title = title[:30] + "..." if len(title) > 30 else title
-            st.subheader(display_title)
-            
-            # 원제목 (다른 경우에만)
-            if original_title and original_title != title:
-                st.caption(f"*{original_title[:35]}*")
-            
-            # 기본 정보
-            st.write(f"**영화 ID:** {movie_id}")
-            st.write(f"**🎯 예측평점:** {predicted_rating:.2f}")
-            
-            # 추가 정보 (있는 경우)
-            if release_date:
-                release_year = release_date[:4] if len(release_date) >= 4 else release_date
-                st.write(f"**개봉:** {release_year}")
-            
-            if genres:
-                genres_str = ', '.join(genres[:3])  # 최대 3개 장르
-                st.write(f"**장르:** {genres_str}")
+            show_original = original_title and original_title != title
+            st.markdown(_CARD_INFO_TEMPLATE.format_map({
+                'title': display_title,
+                'original_line': f":gray[*{original_title[:35]}*]\n\n" if show_original else '',
+                'movie_id': movie_id,
+                'rating': predicted_rating,
+                'year_line': f"  \n**개봉:** {release_year}" if release_year else '',
+                'genres_line': f"  \n**장르:** {genres_str}" if genres_str else ''
+            }))
         
         with col2:
             # 포스터 이미지 (130px로 복원)
+            # - 화면에 보일 때 내려받도록 지연 로딩, 클릭하면 큰 이미지 열기
             if poster_url:
-                try:
-                    st.image(poster_url, width=130)
-                except:
-                    st.write("🎬 포스터 로드 실패")
+                st.markdown(
+                    _POSTER_HTML_TEMPLATE.format_map({
+                        'large_url': poster_large_url,
+                        'url': poster_url,
+                        'alt': html.escape(title)
+                    }),
+                    unsafe_allow_html=True
+                )
             else:
-                st.write("🎬")
-                st.write("포스터 없음")
+                st.markdown("🎬\n\n포스터 없음")
 
+@st.fragment(run_every="30s")
 def show_api_status():
-    """API 연결 상태 표시"""
-    st.sidebar.title("🔧 시스템 상태")
+    """
+    API 연결 상태 표시 (사이드바 안에서 호출, 30초마다 이 부분만 다시 실행)
+    
+    fragment 안에서는 st.sidebar를 직접 쓸 수 없으므로 호출 측의 사이드바 컨테이너 블록에 그립니다.
+    연결 여부는 st.session_state['api_connected']에 저장하고, 바뀌면 앱 전체를 다시 실행합니다.
+    """
+    st.title("🔧 시스템 상태")
     
     # FastAPI 상태 확인
-    health_data, success = get_api_data("health")
+    health_data, success = get_health()
+    if st.session_state.get('api_connected', True) != success:
+        st.session_state['api_connected'] = success
+        if success:
+            # 서버가 꺼져 있던 동안 캐시된 실패 응답을 버리고 다시 조회 (수동 새로고침과 동일)
+            get_api_data.clear()
+            _load_predictions_df.clear()
+        st.rerun()
     
     if success and health_data.get('status') == 'healthy':
-        st.sidebar.markdown('<p class="status-good">✅ FastAPI 서버 정상</p>', unsafe_allow_html=True)
+        st.markdown('<p class="status-good">✅ FastAPI 서버 정상</p>', unsafe_allow_html=True)
         
         details = health_data.get('service_details', {})
-        st.sidebar.write("**서비스 상태:**")
-        st.sidebar.write(f"• 모델 로드: {'✅' if details.get('model_loaded') else '❌'}")
-        st.sidebar.write(f"• 데이터 로드: {'✅' if details.get('data_loaded') else '❌'}")
-        st.sidebar.write(f"• 예측 완료: {'✅' if details.get('predictions_available') else '❌'}")
-        st.sidebar.write(f"• 영화 수: {details.get('sample_count', 0)}개")
+        st.write("**서비스 상태:**")
+        st.write(f"• 모델 로드: {'✅' if details.get('model_loaded') else '❌'}")
+        st.write(f"• 데이터 로드: {'✅' if details.get('data_loaded') else '❌'}")
+        st.write(f"• 예측 완료: {'✅' if details.get('predictions_available') else '❌'}")
+        st.write(f"• 영화 수: {details.get('sample_count', 0)}개")
         
     else:
-        st.sidebar.markdown('<p class="status-bad">❌ FastAPI 서버 연결 실패</p>', unsafe_allow_html=True)
-        st.sidebar.error(f"오류: {health_data.get('error', '알 수 없는 오류')}")
+        st.markdown('<p class="status-bad">❌ FastAPI 서버 연결 실패</p>', unsafe_allow_html=True)
+        st.error(f"오류: {health_data.get('error', '알 수 없는 오류')}")
     
     # TMDB API 상태 확인
-    st.sidebar.write("**TMDB API:**")
+    st.write("**TMDB API:**")
     if TMDB_API_KEY:
-        st.sidebar.markdown('<p class="status-good">✅ API 키 설정됨</p>', unsafe_allow_html=True)
-        st.sidebar.write(f"API 키: {TMDB_API_KEY[:8]}***")
+        st.markdown('<p class="status-good">✅ API 키 설정됨</p>', unsafe_allow_html=True)
+        st.write(f"API 키: {TMDB_API_KEY[:8]}***")
+    else:
+        st.markdown('<p class="status-bad">⚠️ TMDB API 키 미설정</p>', unsafe_allow_html=True)
+        st.info("영화 제목과 포스터를 보려면 .env 파일에 TMDB_API_KEY를 설정하세요.")
+
+@st.fragment
+def render_top_movies(enable_tmdb):
+    """
+    TOP 영화 탭 본문 (fragment - 개수 변경 시 이 부분만 다시 실행)
+    
+    Args:
+        enable_tmdb (bool): TMDB 영화 정보 표시 여부
+    """
+    # 상위 영화 개수 선택
+    top_count = st.selectbox("표시할 영화 개수", TOP_COUNT_OPTIONS, index=1)
+    
+    # 항상 최대 개수로 조회해서 잘라 쓰기 (개수를 바꿔도 같은 캐시 항목 사용)
+    top_movies_data, top_success = get_api_data("top-movies", {"limit": TOP_COUNT_OPTIONS[-1]})
+    
+    if top_success:
+        movies = top_movies_data['data']['top_movies'][:top_count]
+        total_movies = top_movies_data['data']['total_movies']
+        
+        st.info(f"총 {total_movies}개 영화 중 상위 {top_count}개 표시")
+        
+        # 차트 표시
+        st.plotly_chart(build_top_movies_chart(movies, top_count), use_container_width=True)
+        
+        # 영화 카드 섹션
+        st.subheader("🎬 상위 영화 상세 정보")
+        
+        # 한 줄에 2개씩 표시 (더 깔끔하게)
+        # - 기본 정보 카드를 먼저 그려두고, TMDB 정보를 받은 뒤 같은 자리를 다시 채움
+        placeholders = []
+        for i in range(0, len(movies), 2):
+            cols = st.columns(2)
+            for j, col in enumerate(cols):
+                if i + j < len(movies):
+                    placeholder = col.empty()
+                    with placeholder.container():
+                        display_simple_movie_card(movies[i + j])
+                    placeholders.append(placeholder)
+        
+        # TMDB 정보는 한 번에 가져오기
+        # - FastAPI의 일괄 조회 엔드포인트 1회 호출 (실패 시 TMDB 직접 병렬 조회)
+        if enable_tmdb:
+            movie_ids = [movie['movie_id'] for movie in movies]
+            details_data, details_success = get_api_data(
+                "movies/details", {"ids": ",".join(map(str, movie_ids))}
+            )
+            if details_success:
+                details_list = details_data['data']['details']
+            elif TMDB_API_KEY:
+                details_list = get_movie_details_many(movie_ids)
+            else:
+                details_list = []
+            
+            for placeholder, movie, movie_details in zip(placeholders, movies, details_list):
+                if movie_details:
+                    with placeholder.container():
+                        display_simple_movie_card(movie, movie_details)
+        
+        # 정보 메시지
+        if not enable_tmdb:
+            st.info("💡 TMDB 영화 정보를 보려면 사이드바에서 '🎬 TMDB 영화 정보 표시'를 체크하세요.")
+        elif not TMDB_API_KEY:
+            st.warning("⚠️ TMDB API 키가 설정되지 않아 기본 정보만 표시됩니다.")
     else:
-        st.sidebar.markdown('<p class="status-bad">⚠️ TMDB API 키 미설정</p>', unsafe_allow_html=True)
-        st.sidebar.info("영화 제목과 포스터를 보려면 .env 파일에 TMDB_API_KEY를 설정하세요.")
+        st.error("상위 영화 데이터를 불러올 수 없습니다.")
+
+@st.fragment
+def render_prediction_table(df_all):
+    """
+    전체 데이터 탭의 필터/정렬/테이블 (fragment - 슬라이더 조작 시 이 부분만 다시 실행)
     
-    return success
+    Args:
+        df_all (pd.DataFrame): 예측평점 오름차순으로 정렬된 movie_id, predicted_rating 컬럼의 전체 예측 결과
+    """
+    # get_predictions_df에서 이미 평점 오름차순 정렬 (재실행마다 argsort 하지 않음)
+    ratings = df_all['predicted_rating'].to_numpy()
+    movie_ids = df_all['movie_id'].to_numpy()
+    rating_min, rating_max = float(ratings[0]), float(ratings[-1])
+    
+    # 데이터 필터링
+    st.subheader("🔍 데이터 필터링")
+    
+    # 최소/최대를 하나의 범위 슬라이더로 선택
+    min_rating, max_rating = st.slider(
+        "예측평점 범위", rating_min, rating_max, (rating_min, rating_max)
+    )
+    
+    # 필터링된 데이터 (정렬된 배열에서 이진 탐색으로 범위 찾기 - 복사 없는 슬라이스)
+    lo = np.searchsorted(ratings, min_rating, side='left')
+    hi = np.searchsorted(ratings, max_rating, side='right')
+    filtered_ids = movie_ids[lo:hi]
+    filtered_ratings = ratings[lo:hi]
+    
+    st.info(f"필터링 결과: {len(filtered_ids)}개 영화")
+    
+    # 데이터 테이블
+    st.subheader("📊 데이터 테이블")
+    
+    # 정렬 옵션
+    sort_option = st.selectbox("정렬 기준", 
+                             ["예측평점 (높음→낮음)", "예측평점 (낮음→높음)", "영화 ID"])
+    
+    # 필터/정렬 결과 배열 (표시와 CSV 다운로드에서 공유 - 전체 DataFrame 행 복사 없음)
+    if sort_option == "예측평점 (높음→낮음)":
+        filtered_ids = filtered_ids[::-1]
+        filtered_ratings = filtered_ratings[::-1]
+    elif sort_option == "영화 ID":
+        id_order = np.argsort(filtered_ids, kind='stable')
+        filtered_ids = filtered_ids[id_order]
+        filtered_ratings = filtered_ratings[id_order]
+    
+    # 순위 추가 (표시할 3개 컬럼 배열을 그대로 감싸서 DataFrame 구성)
+    filtered_df_display = pd.DataFrame({
+        '순위': np.arange(1, len(filtered_ids) + 1),
+        '영화 ID': filtered_ids,
+        '예측평점': filtered_ratings.round(2)
+    }, copy=False)
+    
+    # 테이블 표시
+    display_dataframe_quickly(
+        filtered_df_display,
+        max_rows=5000,
+        use_container_width=True,
+        hide_index=True
+    )
+    
+    # CSV 다운로드
+    csv = make_predictions_csv(filtered_ids, filtered_ratings)
+    st.download_button(
+        label="📥 CSV 다운로드",
+        data=csv,
+        file_name=f"movie_predictions_filtered_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+        mime="text/csv"
+    )
 
 def main():
     # 메인 헤더
@@ -196,11 +626,16 @@ def main():
     st.markdown("---")
     
     # API 상태 확인
-    api_connected = show_api_status()
+    # - 상태 표시 자리만 사이드바 맨 위에 잡아두고, 헬스체크는 탭 본문을 그린 뒤에 실행
+    # - 연결 여부는 직전 헬스체크 결과(session_state)를 사용 (첫 실행은 연결된 것으로 가정)
+    status_container = st.sidebar.container()
     
-    if not api_connected:
+    if not st.session_state.get('api_connected', True):
         st.error("🔌 FastAPI 서버에 연결할 수 없습니다. FastAPI 서버를 먼저 실행해주세요.")
-        st.code("cd movie-mlops-project/serving\npython main.py")
+        st.code("cd movie-mlops-project\npython -m serving.main")
+        # 상태 fragment는 계속 실행해서 서버가 다시 뜨면 자동으로 대시보드로 복귀
+        with status_container:
+            show_api_status()
         st.stop()
     
     # 사이드바 컨트롤
@@ -216,28 +651,38 @@ def main():
     
     auto_refresh = st.sidebar.checkbox("자동 새로고침 (30초)", value=False)
     if auto_refresh:
+        # 브라우저 타이머로 30초마다 재실행 (서버 스레드를 sleep으로 붙잡지 않음)
+        st_autorefresh(interval=30_000, key="autorefresh")
         st.sidebar.write(f"마지막 업데이트: {datetime.now().strftime('%H:%M:%S')}")
-        time.sleep(0.1)
-        st.rerun()
     
     if st.sidebar.button("🔄 수동 새로고침"):
-        st.cache_data.clear()
+        # 예측 API 응답만 다시 받기 (TMDB 영화 정보 캐시는 유지)
+        get_api_data.clear()
+        get_health.clear()
+        _load_predictions_df.clear()
         st.rerun()
     
     # 메인 탭
-    tab1, tab2, tab3, tab4 = st.tabs(["📊 대시보드", "🏆 TOP 영화", "📈 통계 분석", "📋 전체 데이터"])
+    # - st.tabs는 모든 탭 본문을 매번 실행하므로, 선택한 탭만 그리는 가로 라디오 버튼으로 전환
+    active_tab = st.radio(
+        "탭 선택",
+        TAB_LABELS,
+        horizontal=True,
+        label_visibility="collapsed",
+        key="active_tab"
+    )
     
     # ========================================
     # 탭 1: 대시보드
     # ========================================
-    with tab1:
+    if active_tab == TAB_LABELS[0]:
         st.header("📊 예측 대시보드")
         
-        stats_data, stats_success = get_api_data("stats")
+        # 통계는 예측 결과에서 바로 계산 (통계 분석/전체 데이터 탭과 같은 캐시 공유)
+        df_all, pred_success = get_predictions_df()
         
-        if stats_success:
-            stats = stats_data['data']['statistics']
-            distribution = stats_data['data']['distribution']
+        if pred_success:
+            stats, distribution = compute_dashboard_stats(df_all)
             
             # 메트릭 카드
             col1, col2, col3, col4 = st.columns(4)
@@ -254,121 +699,38 @@ def main():
             # 예측평점 분포 차트
             st.subheader("🎯 예측평점 구간별 분포")
             
-            dist_df = pd.DataFrame(list(distribution.items()), columns=['구간', '영화수'])
-            
-            fig_bar = px.bar(
-                dist_df, 
-                x='구간', 
-                y='영화수',
-                title="예측평점 구간별 영화 분포",
-                color='영화수',
-                color_continuous_scale='viridis'
-            )
-            fig_bar.update_layout(height=400)
-            st.plotly_chart(fig_bar, use_container_width=True)
+            st.plotly_chart(build_distribution_chart(distribution), use_container_width=True)
         else:
             st.error("통계 데이터를 불러올 수 없습니다.")
     
     # ========================================
     # 탭 2: TOP 영화 (간단한 카드 스타일)
     # ========================================
-    with tab2:
+    elif active_tab == TAB_LABELS[1]:
         st.header("🏆 예측평점 상위 영화")
         
-        # 상위 영화 개수 선택
-        top_count = st.selectbox("표시할 영화 개수", [5, 10, 20, 30], index=1)
-        
-        top_movies_data, top_success = get_api_data("top-movies", {"limit": top_count})
-        
-        if top_success:
-            movies = top_movies_data['data']['top_movies']
-            total_movies = top_movies_data['data']['total_movies']
-            
-            st.info(f"총 {total_movies}개 영화 중 상위 {top_count}개 표시")
-            
-            # 차트 표시
-            df_top = pd.DataFrame(movies)
-            
-            fig_top = px.bar(
-                df_top, 
-                x='rank', 
-                y='predicted_rating',
-                title=f"🎬 예측평점 상위 {top_count}개 영화",
-                labels={'predicted_rating': '예측평점', 'rank': '순위'},
-                color='predicted_rating',
-                color_continuous_scale='plasma',
-                text='predicted_rating'
-            )
-            fig_top.update_traces(texttemplate='%{text:.2f}', textposition='outside')
-            fig_top.update_layout(height=500)
-            st.plotly_chart(fig_top, use_container_width=True)
-            
-            # 영화 카드 섹션
-            st.subheader("🎬 상위 영화 상세 정보")
-            
-            # 한 줄에 2개씩 표시 (더 깔끔하게)
-            for i in range(0, len(movies[:top_count]), 2):
-                cols = st.columns(2)
-                for j, col in enumerate(cols):
-                    if i + j < len(movies[:top_count]):
-                        movie = movies[i + j]
-                        with col:
-                            # TMDB 정보 가져오기
-                            movie_details = None
-                            if enable_tmdb and TMDB_API_KEY:
-                                movie_details = get_movie_details(movie['movie_id'])
-                            
-                            # 간단한 카드 표시
-                            display_simple_movie_card(movie, movie_details)
-            
-            # 정보 메시지
-            if not enable_tmdb:
-                st.info("💡 TMDB 영화 정보를 보려면 사이드바에서 '🎬 TMDB 영화 정보 표시'를 체크하세요.")
-            elif not TMDB_API_KEY:
-                st.warning("⚠️ TMDB API 키가 설정되지 않아 기본 정보만 표시됩니다.")
-        else:
-            st.error("상위 영화 데이터를 불러올 수 없습니다.")
+        render_top_movies(enable_tmdb)
     
     # ========================================
     # 탭 3: 통계 분석
     # ========================================
-    with tab3:
+    elif active_tab == TAB_LABELS[2]:
         st.header("📈 통계 분석")
         
-        # 전체 예측 데이터 가져오기
-        predictions_data, pred_success = get_api_data("predictions")
+        df_all, pred_success = get_predictions_df()
         
         if pred_success:
-            results = predictions_data['data']['predictions']
-            df_all = pd.DataFrame(results)
-            
             st.success(f"✅ {len(df_all)}개 영화 데이터 로드 완료!")
             
             # 히스토그램
             st.subheader("📊 예측평점 분포 히스토그램")
             
-            fig_hist = px.histogram(
-                df_all, 
-                x='predicted_rating',
-                nbins=20,
-                title="예측평점 분포",
-                labels={'predicted_rating': '예측평점', 'count': '영화 수'},
-                color_discrete_sequence=['#FF6B6B']
-            )
-            fig_hist.update_layout(height=400)
-            st.plotly_chart(fig_hist, use_container_width=True)
+            st.plotly_chart(build_rating_histogram(df_all), use_container_width=True)
             
             # 박스플롯
             st.subheader("📦 예측평점 박스플롯")
             
-            fig_box = px.box(
-                df_all, 
-                y='predicted_rating',
-                title="예측평점 분포 (박스플롯)",
-                labels={'predicted_rating': '예측평점'}
-            )
-            fig_box.update_layout(height=400)
-            st.plotly_chart(fig_box, use_container_width=True)
+            st.plotly_chart(build_rating_boxplot(df_all), use_container_width=True)
             
             # 통계 요약
             col1, col2 = st.columns(2)
@@ -380,9 +742,10 @@ def main():
             
             with col2:
                 st.subheader("🎯 분위수 정보")
-                quantiles = df_all['predicted_rating'].quantile([0.1, 0.25, 0.5, 0.75, 0.9])
+                quantile_levels = [0.1, 0.25, 0.5, 0.75, 0.9]
+                quantiles = np.quantile(df_all['predicted_rating'].to_numpy(), quantile_levels)
                 st.write("**분위수별 예측평점:**")
-                for q, value in quantiles.items():
+                for q, value in zip(quantile_levels, quantiles):
                     st.write(f"• {q*100:.0f}%: {value:.2f}")
                     
         else:
@@ -391,73 +754,13 @@ def main():
     # ========================================
     # 탭 4: 전체 데이터
     # ========================================
-    with tab4:
+    elif active_tab == TAB_LABELS[3]:
         st.header("📋 전체 예측 데이터")
         
-        predictions_data, pred_success = get_api_data("predictions")
+        df_all, pred_success = get_predictions_df()
         
         if pred_success:
-            results = predictions_data['data']['predictions']
-            df_all = pd.DataFrame(results)
-            
-            # 데이터 필터링
-            st.subheader("🔍 데이터 필터링")
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                min_rating = st.slider("최소 예측평점", 
-                                     float(df_all['predicted_rating'].min()), 
-                                     float(df_all['predicted_rating'].max()), 
-                                     float(df_all['predicted_rating'].min()))
-            with col2:
-                max_rating = st.slider("최대 예측평점", 
-                                     float(df_all['predicted_rating'].min()), 
-                                     float(df_all['predicted_rating'].max()), 
-                                     float(df_all['predicted_rating'].max()))
-            
-            # 필터링된 데이터
-            filtered_df = df_all[
-                (df_all['predicted_rating'] >= min_rating) & 
-                (df_all['predicted_rating'] <= max_rating)
-            ]
-            
-            st.info(f"필터링 결과: {len(filtered_df)}개 영화")
-            
-            # 데이터 테이블
-            st.subheader("📊 데이터 테이블")
-            
-            # 정렬 옵션
-            sort_option = st.selectbox("정렬 기준", 
-                                     ["예측평점 (높음→낮음)", "예측평점 (낮음→높음)", "영화 ID"])
-            
-            if sort_option == "예측평점 (높음→낮음)":
-                filtered_df = filtered_df.sort_values('predicted_rating', ascending=False)
-            elif sort_option == "예측평점 (낮음→높음)":
-                filtered_df = filtered_df.sort_values('predicted_rating', ascending=True)
-            else:
-                filtered_df = filtered_df.sort_values('movie_id')
-            
-            # 순위 추가
-            filtered_df_display = filtered_df.copy()
-            filtered_df_display['순위'] = range(1, len(filtered_df_display) + 1)
-            filtered_df_display['영화 ID'] = filtered_df_display['movie_id']
-            filtered_df_display['예측평점'] = filtered_df_display['predicted_rating'].round(2)
-            
-            # 테이블 표시
-            st.dataframe(
-                filtered_df_display[['순위', '영화 ID', '예측평점']],
-                use_container_width=True,
-                hide_index=True
-            )
-            
-            # CSV 다운로드
-            csv = filtered_df.to_csv(index=False)
-            st.download_button(
-                label="📥 CSV 다운로드",
-                data=csv,
-                file_name=f"movie_predictions_filtered_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                mime="text/csv"
-            )
+            render_prediction_table(df_all)
             
         else:
             st.error("예측 데이터를 불러올 수 없습니다.")
@@ -468,6 +771,10 @@ def main():
     if TMDB_API_KEY:
         st.markdown("**🎬 TMDB API**: 영화 제목, 포스터, 장르 정보 연동 중")
     st.markdown(f"**🕒 마지막 업데이트**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    
+    # 사이드바 상태 표시 (탭 본문이 먼저 화면에 그려진 뒤 헬스체크)
+    with status_container:
+        show_api_status()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
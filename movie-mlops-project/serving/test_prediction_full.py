@@ -1,13 +1,7 @@
 import logging
-import sys
-import os
+import numpy as np
 
-# 경로 설정
-current_dir = os.path.dirname(os.path.abspath(__file__))
-parent_dir = os.path.dirname(current_dir)
-sys.path.append(parent_dir)
-
-from services.prediction_service import SimplePredictionService
+from serving.services.prediction_service import SimplePredictionService
 
 # 로깅 설정
 logging.basicConfig(
@@ -70,12 +64,12 @@ def test_full_prediction_workflow():
     
     # 예측 통계
     print(f"\n5️⃣ 예측 통계...")
-    ratings = [result['predicted_rating'] for result in predictions['results']]
+    # 응답 dict 리스트 대신 서비스가 보관 중인 예측값 배열로 바로 계산
+    ratings = service.predictions['predictions']
     
-    import statistics
-    avg_rating = statistics.mean(ratings)
-    max_rating = max(ratings)
-    min_rating = min(ratings)
+    avg_rating = float(ratings.mean(dtype=np.float64))
+    max_rating = float(ratings.max())
+    min_rating = float(ratings.min())
     
     print(f"   평균 예측 평점: {avg_rating:.2f}")
     print(f"   최고 예측 평점: {max_rating:.2f}")
@@ -1,11 +1,6 @@
-import sys
-import os
 import logging
 
-# 상위 디렉토리의 services 모듈을 import 할 수 있도록 경로 추가
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from services.mlflow_service import MLflowModelService
+from serving.services.mlflow_service import MLflowModelService
 
 # 로깅 설정
 logging.basicConfig(
@@ -34,7 +29,7 @@ def test_mlflow_connection():
         print(f"   성공 여부: {result['success']}")
         print(f"   메시지: {result['message']}")
         print(f"   Tracking URI: {result['tracking_uri']}")
-        print(f"   실험 수: {result['experiments_count']}")
+        print(f"   실험 조회: {'✅' if result['experiment_found'] else '❌'}")
         
         return result['success']
         